@@ -1,20 +1,29 @@
+from typing import TextIO
+
 import click
 
 from file_manager.logs import log_messages
-from file_manager.utils import organizer, scanner
+from file_manager.logs.logger_factory import close_logger
+from file_manager.utils.matcher import NameMatcher
+from file_manager.utils import hasher, linker, organizer, predicates, scanner
 from file_manager.utils.decorator import (
+    ByteSize,
+    PointInTime,
     save_logs,
     sort_order_results,
     create_backup,
+    parallel_jobs,
     recursive,
     show_hidden_entries,
+    structured_output,
 )
 
 
 @click.group()
 def fm() -> None:
     """Good old command-line file manager\f"""
-    pass
+    # flush buffered output when the command ends (also if it fails -> before the traceback)
+    click.get_current_context().call_on_close(close_logger)
 
 
 # ### scan ###
@@ -35,37 +44,49 @@ def show(
     show_hidden: bool,
     sort: str,
     desc: bool,
+    limit: int,
+    unsorted: bool,
     list_dirs: bool,
     save: bool,
     output: str,
     log: str,
 ) -> None:
     """Short list of files or directories in <dir_path>\f"""
-    scanner.show(dir_path, show_hidden, sort, desc, list_dirs, save, output, log)
+    _check_unsorted(sort, desc, unsorted)
+    scanner.show(dir_path, show_hidden, sort, desc, limit, unsorted, list_dirs, save, output, log)
 
 
 #############################################################
 @fm.command(options_metavar="<options>")
 @click.argument("dir_path", type=click.STRING, metavar="<dir_path>")
+@parallel_jobs
 @recursive
 @show_hidden_entries
 @sort_order_results
+@structured_output
 @save_logs
 def scan(
     dir_path: str,
+    jobs: int,
     recursively: bool,
     show_hidden: bool,
     sort: str,
     desc: bool,
+    limit: int,
+    unsorted: bool,
+    output_format: str,
     save: bool,
     output: str,
     log: str,
 ) -> None:
     """Create full catalog of all files and subdirs in <dir_path>\f"""
+    _check_unsorted(sort, desc, unsorted)
     if recursively:
-        scanner.scan_recursively(dir_path, show_hidden, sort, desc, save, output, log)
+        scanner.scan_recursively(
+            dir_path, show_hidden, sort, desc, limit, unsorted, save, output, log, jobs, output_format
+        )
     else:
-        scanner.scan(dir_path, show_hidden, sort, desc, save, output, log)
+        scanner.scan(dir_path, show_hidden, sort, desc, limit, unsorted, save, output, log, output_format)
 
 
 #############################################################
@@ -78,6 +99,13 @@ def scan(
     type=click.IntRange(0),
     help="Maximum depth of representation",
 )
+@click.option(
+    "-i",
+    "--ignore",
+    type=click.STRING,
+    default=None,
+    help="Single or multiple directory names to be ignored separated by comma. E.g. --ignore music,books",
+)
 @click.option(
     "-d",
     "--dirs",
@@ -85,25 +113,32 @@ def scan(
     is_flag=True,
     help="Show only nested directories",
 )
+@parallel_jobs
 @show_hidden_entries
+@structured_output
 @save_logs
 def tree(
     dir_path: str,
     max_depth: int,
+    ignore: str,
     dirs_only: bool,
+    jobs: int,
     show_hidden: bool,
+    output_format: str,
     save: bool,
     output: str,
     log: str,
 ) -> None:
     """Build tree of contents in <dir_path>\f"""
-    scanner.build_tree(dir_path, max_depth, show_hidden, dirs_only, save, output, log)
+    scanner.build_tree(
+        dir_path, max_depth, ignore, show_hidden, dirs_only, save, output, log, jobs, output_format
+    )
 
 
 #############################################################
 @fm.command(options_metavar="<options>")
 @click.argument("dir_path", type=click.STRING, metavar="<dir_path>")
-@click.argument("name", type=click.STRING, metavar="<name>")
+@click.argument("name", type=click.STRING, metavar="<name>", required=False)
 @click.option(
     "-x",
     "--regex",
@@ -111,22 +146,199 @@ def tree(
     is_flag=True,
     help="Search by regex pattern",
 )
+@click.option(
+    "-e",
+    "--pattern",
+    "patterns",
+    type=click.STRING,
+    multiple=True,
+    help="Additional keyword or pattern. Can be repeated e.g. -e foo -e bar",
+)
+@click.option(
+    "--patterns-file",
+    type=click.File(encoding="utf-8"),
+    default=None,
+    help="Read additional keywords or patterns from file (one per line)",
+)
+@click.option(
+    "--index",
+    "use_index",
+    is_flag=True,
+    help="Look up names in the index built by 'fm index' instead of walking the tree",
+)
+@click.option(
+    "-c",
+    "--content",
+    "in_content",
+    is_flag=True,
+    help="Search inside the contents of text files instead of their names (binary files are skipped)",
+)
+@click.option(
+    "-m",
+    "--max-count",
+    type=click.IntRange(1),
+    default=None,
+    help="Stop reading a file after N matching lines. (Used with --content flag)",
+)
+@parallel_jobs
 @recursive
+@structured_output
 @save_logs
 def search(
     dir_path: str,
     name: str,
     use_regex: bool,
+    patterns: tuple[str, ...],
+    patterns_file: TextIO,
+    use_index: bool,
+    in_content: bool,
+    max_count: int,
+    jobs: int,
     recursively: bool,
+    output_format: str,
     save: bool,
     output: str,
     log: str,
 ) -> None:
     """Search by <name> inside <dir_path>\f"""
-    if recursively:
-        scanner.search_recursively(dir_path, name, use_regex, save, output, log)
+    patterns = _collect_patterns(name, patterns, patterns_file)
+    if in_content and use_index:
+        raise click.BadParameter(log_messages.BAD_OPTS.format(flags=" | ".join(("content", "index"))))
+    if in_content:
+        scanner.search_content(
+            dir_path, patterns, use_regex, recursively, max_count, save, output, log, jobs, output_format
+        )
+    elif use_index:
+        scanner.search_in_index(dir_path, patterns, use_regex, recursively, save, output, log, output_format)
+    elif recursively:
+        scanner.search_recursively(
+            dir_path, patterns, use_regex, save, output, log, jobs=jobs, output_format=output_format
+        )
     else:
-        scanner.search(dir_path, name, use_regex, save, output, log)
+        scanner.search(dir_path, patterns, use_regex, save, output, log, output_format)
+
+
+#############################################################
+@fm.command(options_metavar="<options>")
+@click.argument("dir_path", type=click.STRING, metavar="<dir_path>")
+@click.option(
+    "-n",
+    "--name",
+    "patterns",
+    type=click.STRING,
+    multiple=True,
+    help="Keyword (or pattern with --regex) the entry name must contain. Can be repeated e.g. -n foo -n bar",
+)
+@click.option(
+    "-x",
+    "--regex",
+    "use_regex",
+    is_flag=True,
+    help="Match names by regex pattern",
+)
+@click.option(
+    "--ext",
+    type=click.STRING,
+    default=None,
+    help="Single or multiple file extensions separated by comma e.g. --ext .pdf,.mp3",
+)
+@click.option(
+    "-t",
+    "--type",
+    "entry_type",
+    type=click.Choice(predicates.ENTRY_TYPES, case_sensitive=False),
+    default=None,
+    help="Find only files (f) or only directories (d)",
+)
+@click.option(
+    "--min-size",
+    type=ByteSize(),
+    default=None,
+    help="Minimum size e.g. 1G",
+)
+@click.option(
+    "--max-size",
+    type=ByteSize(),
+    default=None,
+    help="Maximum size e.g. 512K",
+)
+@click.option(
+    "--newer",
+    type=PointInTime(),
+    default=None,
+    help="Modified after the given age or date e.g. 7d or 2024-01-31",
+)
+@click.option(
+    "--older",
+    type=PointInTime(),
+    default=None,
+    help="Modified before the given age or date e.g. 90d or 2024-01-31",
+)
+@parallel_jobs
+@recursive
+@structured_output
+@save_logs
+def find(
+    dir_path: str,
+    patterns: tuple[str, ...],
+    use_regex: bool,
+    ext: str,
+    entry_type: str,
+    min_size: int,
+    max_size: int,
+    newer: float,
+    older: float,
+    jobs: int,
+    recursively: bool,
+    output_format: str,
+    save: bool,
+    output: str,
+    log: str,
+) -> None:
+    """Find entries inside <dir_path> by name, extension, type, size and modification time\f"""
+    entry_filter = predicates.EntryFilter(
+        NameMatcher(list(patterns), use_regex) if patterns else None,
+        ext.split(",") if ext else None,
+        entry_type.lower() if entry_type else None,
+        min_size,
+        max_size,
+        newer,
+        older,
+    )
+    scanner.find_entries(dir_path, entry_filter, recursively, save, output, log, jobs, output_format)
+
+
+#############################################################
+@fm.command(options_metavar="<options>")
+@click.argument("dir_path", type=click.STRING, metavar="<dir_path>")
+@save_logs
+def index(dir_path: str, save: bool, output: str, log: str) -> None:
+    """Build or refresh the file name index of <dir_path> used by search --index\f"""
+    scanner.build_index(dir_path, save, output, log)
+
+
+#############################################################
+@fm.command(options_metavar="<options>")
+@click.argument("dir_path", type=click.STRING, metavar="<dir_path>")
+@click.option(
+    "-o",
+    "--output",
+    "manifest_path",
+    type=click.STRING,
+    required=True,
+    help="Path to the manifest file. Compressed with gzip if it ends with .gz",
+)
+@click.option(
+    "--hash",
+    "hash_algorithm",
+    type=click.Choice([name for name in hasher.HASH_MAP if name not in hasher.VERIFIED_ALGORITHMS]),
+    default=None,
+    help="Also record content hashes of files (compared by diff when sizes match but mtimes differ)",
+)
+@parallel_jobs
+def snapshot(dir_path: str, manifest_path: str, hash_algorithm: str, jobs: int) -> None:
+    """Write manifest of all entries in <dir_path> (relative path, size, mtime, hash) to use with diff\f"""
+    scanner.snapshot(dir_path, manifest_path, hash_algorithm, jobs)
 
 
 #############################################################
@@ -151,8 +363,20 @@ def search(
     is_flag=True,
     help="Show compact list on single line",
 )
+@click.option(
+    "--deep",
+    is_flag=True,
+    help="Compare common files by size and content hash instead of their stat signature",
+)
+@click.option(
+    "--detect-moves",
+    is_flag=True,
+    help="Match files found on one side only by size and content hash and report them as moved or renamed",
+)
+@parallel_jobs
 @recursive
 @show_hidden_entries
+@structured_output
 @save_logs
 def diff(
     dir_path: str,
@@ -160,13 +384,17 @@ def diff(
     ignore: str,
     short: bool,
     one_line: bool,
+    deep: bool,
+    detect_moves: bool,
+    jobs: int,
     recursively: bool,
     show_hidden: bool,
+    output_format: str,
     save: bool,
     output: str,
     log: str,
 ) -> None:
-    """Compare contents of <source_path> to <target_path>\f"""
+    """Compare contents of <source_path> to <target_path> (dirs or manifests written by snapshot)\f"""
     if short and one_line:
         raise click.BadParameter(log_messages.BAD_OPTS.format(flags=" | ".join(("short", "oneline"))))
     scanner.compare_directories(
@@ -180,6 +408,59 @@ def diff(
         save,
         output,
         log,
+        output_format,
+        deep,
+        jobs,
+        detect_moves,
+    )
+
+
+#############################################################
+@fm.command(options_metavar="<options>")
+@click.argument("dir_path", type=click.STRING, metavar="<source_path>")
+@click.argument("other_path", type=click.STRING, metavar="<target_path>")
+@click.option(
+    "-i",
+    "--ignore",
+    type=click.STRING,
+    default=None,
+    help="Single or multiple directory names to be ignored separated by comma. E.g. --ignore music,books",
+)
+@click.option(
+    "--delete",
+    is_flag=True,
+    help="Remove entries of <target_path> missing in <source_path>",
+)
+@click.option(
+    "-n",
+    "--dry-run",
+    is_flag=True,
+    help="Only show what would be copied or removed",
+)
+@click.option(
+    "--deep",
+    is_flag=True,
+    help="Compare common files by size and content hash instead of their stat signature",
+)
+@parallel_jobs
+@show_hidden_entries
+@save_logs
+def sync(
+    dir_path: str,
+    other_path: str,
+    ignore: str,
+    delete: bool,
+    dry_run: bool,
+    deep: bool,
+    jobs: int,
+    show_hidden: bool,
+    save: bool,
+    output: str,
+    log: str,
+) -> None:
+    """Mirror <source_path> into <target_path> copying only new or changed files\f"""
+    organizer.sync_directories(
+        dir_path, other_path, ignore, delete, dry_run, deep, jobs, show_hidden, save, output, log
     )
 
 
@@ -193,6 +474,53 @@ def diff(
     is_flag=True,
     help="Prompt for destination file name before merging duplicates",
 )
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(hasher.SAMPLE_SIZE),
+    default=hasher.CHUNK_SIZE,
+    show_default=True,
+    help="Size in bytes of the buffer used to read files while hashing",
+)
+@click.option(
+    "--processes",
+    "use_processes",
+    is_flag=True,
+    help="Hash files in a pool of processes instead of threads (Used with --jobs option)",
+)
+@click.option(
+    "--no-cache",
+    "no_cache",
+    is_flag=True,
+    help="Hash every file instead of reusing hashes of unchanged files from previous runs",
+)
+@click.option(
+    "--global",
+    "global_mode",
+    is_flag=True,
+    help="Find duplicates across all nested dirs instead of inside each dir separately. (Used with --recursively flag)",
+)
+@click.option(
+    "--link",
+    "link_type",
+    type=click.Choice(linker.LINK_TYPES, case_sensitive=False),
+    default=None,
+    help="Replace duplicates with links to the kept file instead of deleting them",
+)
+@click.option(
+    "--hash",
+    "hash_algorithm",
+    type=click.Choice(list(hasher.HASH_MAP), case_sensitive=False),
+    default=hasher.ALGORITHM,
+    show_default=True,
+    help="Hash function used to compare file contents",
+)
+@click.option(
+    "--memory-limit",
+    type=ByteSize(),
+    default=None,
+    help="Keep the duplicate index in sorted files on disk using at most the given memory e.g. 512M. (Used with --global flag)",
+)
+@parallel_jobs
 @recursive
 @show_hidden_entries
 @create_backup
@@ -200,6 +528,14 @@ def diff(
 def dedup(
     dir_path: str,
     interactive: bool,
+    chunk_size: int,
+    use_processes: bool,
+    no_cache: bool,
+    global_mode: bool,
+    link_type: str,
+    hash_algorithm: str,
+    memory_limit: int,
+    jobs: int,
     recursively: bool,
     show_hidden: bool,
     backup: bool,
@@ -209,7 +545,25 @@ def dedup(
     log: str,
 ) -> None:
     """Find and clean-up duplicate files inside a <dir_path>\f"""
-    if recursively:
+    if recursively and global_mode:
+        organizer.handle_duplicate_files_globally(
+            dir_path,
+            interactive,
+            show_hidden,
+            save,
+            output,
+            log,
+            backup,
+            archive_format,
+            chunk_size,
+            jobs,
+            use_processes,
+            not no_cache,
+            link_type,
+            hash_algorithm,
+            memory_limit,
+        )
+    elif recursively:
         organizer.handle_duplicate_files_recursively(
             dir_path,
             interactive,
@@ -219,6 +573,12 @@ def dedup(
             log,
             backup,
             archive_format,
+            chunk_size,
+            jobs,
+            use_processes,
+            not no_cache,
+            link_type,
+            hash_algorithm,
         )
     else:
         organizer.handle_duplicate_files(
@@ -230,9 +590,70 @@ def dedup(
             log,
             backup,
             archive_format,
+            chunk_size,
+            jobs,
+            use_processes,
+            not no_cache,
+            link_type,
+            hash_algorithm,
         )
 
 
+#####################################
+@fm.command("bench-hash", options_metavar="<options>")
+@click.argument("dir_path", type=click.STRING, metavar="<dir_path>")
+@click.option(
+    "--sample-size",
+    type=click.IntRange(1),
+    default=256,
+    show_default=True,
+    help="Amount of data in MB taken from <dir_path> for the benchmark",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(hasher.SAMPLE_SIZE),
+    default=hasher.CHUNK_SIZE,
+    show_default=True,
+    help="Size in bytes of the buffer used to read files while hashing",
+)
+@save_logs
+def bench_hash(
+    dir_path: str,
+    sample_size: int,
+    chunk_size: int,
+    save: bool,
+    output: str,
+    log: str,
+) -> None:
+    """Measure throughput of the dedup hash functions on files from <dir_path>\f"""
+    organizer.benchmark_hash_algorithms(dir_path, sample_size, chunk_size, save, output, log)
+
+
+#####################################
+@fm.command("prune-cache", options_metavar="<options>")
+@click.option(
+    "--max-age",
+    type=click.IntRange(0),
+    default=None,
+    help="Also evict hashes not used by dedup for the given number of days",
+)
+@click.option(
+    "--clear",
+    is_flag=True,
+    help="Evict all cached hashes",
+)
+@save_logs
+def prune_cache(
+    max_age: int,
+    clear: bool,
+    save: bool,
+    output: str,
+    log: str,
+) -> None:
+    """Evict stale entries from the dedup hash cache and compact it\f"""
+    organizer.prune_hash_cache(max_age, clear, save, output, log)
+
+
 #####################################
 @fm.command(options_metavar="<options>")
 @click.argument("dir_path", type=click.STRING, metavar="<dir_path>")
@@ -298,5 +719,21 @@ def tidy(
         )
 
 
+def _collect_patterns(name: str | None, patterns: tuple[str, ...], patterns_file: TextIO | None) -> list[str]:
+    all_patterns = [name] if name else []
+    all_patterns.extend(patterns)
+    if patterns_file:
+        all_patterns.extend(line for line in patterns_file.read().splitlines() if line)
+    if not all_patterns:
+        raise click.BadParameter(log_messages.MISSING_PATTERN)
+    return all_patterns
+
+
+def _check_unsorted(sort: str, desc: bool, unsorted: bool) -> None:
+    if unsorted and (sort or desc):
+        flags = "sort" if sort else "desc"
+        raise click.BadParameter(log_messages.BAD_OPTS.format(flags=" | ".join((flags, "unsorted"))))
+
+
 if __name__ == "__main__":
     fm()
@@ -1,21 +1,34 @@
-LOG_FORMAT = "%(message)s"
-
 DELIMITER = "=========================================\n"
 NO_FILES = "'{dir_path}' contains no files\n" + DELIMITER
-LISTED_FILES = "'{dir_path}' contains the following files:\n\t- {entries_list}\n" + DELIMITER
+ENTRY_LINE = "\t- {entry}\n"
+LISTED_FILES_HEADER = "'{dir_path}' contains the following files:\n"
+LISTED_FILES = LISTED_FILES_HEADER + "\t- {entries_list}\n" + DELIMITER
 
 DUPLICATE_DELIMITER = "-----------------------------------------\n"
 NO_DUPLICATE_FILES = "'{dir_path}' contains no duplicate files\n"
 LISTED_DUPLICATE_FILES = "'{dir_path}' contains the following duplicate files:\n{display_list}"
 
 NO_SUBDIRS = "'{dir_path}' contains no nested subdirectories\n" + DELIMITER
-NESTED_SUBDIRS = "'{dir_path}' contains the following subdirectories:\n\t- {entries_list}\n" + DELIMITER
+NESTED_SUBDIRS_HEADER = "'{dir_path}' contains the following subdirectories:\n"
+NESTED_SUBDIRS = NESTED_SUBDIRS_HEADER + "\t- {entries_list}\n" + DELIMITER
 
 NOT_FOUND = "Nothing found\n"
 FOUND_BY_NAME = "Inside directory '{dir_path}' the given (partial) keyword '{sequence}' was found\n"
 FOUND_BY_PATTERN = "Inside directory '{dir_path}' the given pattern '{sequence}' was found\n"
-FOUND_FILES_BY_NAME = "- in the following file names:\n\t- {files_list}\n"
-FOUND_DIRS_BY_NAME = "- in the following subdirectory names:\n\t- {subdir_list}\n"
+FOUND_BY_NAMES = "Inside directory '{dir_path}' the given (partial) keywords {sequence} were found\n"
+FOUND_BY_PATTERNS = "Inside directory '{dir_path}' the given patterns {sequence} were found\n"
+FOUND_FILES_HEADER = "- in the following file names:\n"
+FOUND_FILES_BY_NAME = FOUND_FILES_HEADER + "\t- {files_list}\n"
+FOUND_DIRS_HEADER = "- in the following subdirectory names:\n"
+FOUND_DIRS_BY_NAME = FOUND_DIRS_HEADER + "\t- {subdir_list}\n"
+FOUND_BY_FILTERS = "Inside directory '{dir_path}' the following entries match the given filters\n"
+MATCHED_FILES_HEADER = "- files:\n"
+MATCHED_DIRS_HEADER = "- subdirectories:\n"
+FOUND_CONTENTS_HEADER = "- in the following file contents:\n"
+CONTENT_MATCH = "\t- {path}:{line_no}:{offset}: {text}\n"
+INDEX_NOT_FOUND = "No index covers '{dir_path}'. Build one with: fm index <dir_path>\n"
+SNAPSHOT_WRITTEN = "Wrote {count} entries of '{dir_path}' into manifest '{manifest_path}'\n"
+INDEX_UPDATED = "Indexed {entries} entries in {dirs} directories of '{dir_path}' ({listed_dirs} read) into '{index_path}'\n"
 
 CREATE_DIR = "Creating directory {target_dir}\n"
 MOVE_FILE = "Moving {entry} to {target_dir}\n"
@@ -29,8 +42,21 @@ SKIP_DIR_AND_MOVE = "Moving {entry} directory without stepping inside\n"
 NOT_REORGANIZED = "Nothing to tidy up\n"
 
 REMOVE_DIR = "Removing {abs_dir_path}\n"
+REMOVE_ENTRY = "Removing {entry}\n"
+COPY_FILE = "Copying {source} to {target}\n"
+DRY_RUN = "(dry run) "
+SYNC_DONE = "Synced '{source}' to '{target}': {copied} files copied, {removed} entries removed\n"
 MERGE_FILES = "Merging duplicates: {entry} into '{target_name}'\n"
+LINK_FILES = "Linking duplicates: {entry} to '{target_name}' ({link_type} links)\n"
+LINK_CONTENT_DIFFERS = "Skipping {entry}: content differs from the kept file\n"
+LINK_NOT_SUPPORTED = "Skipping {entry}: {link_type} links not supported ({error})\n"
 PRE_MERGE_PROMPT = "Please enter file name for the following duplicates: {entry}\n"
+BENCH_SAMPLE = "Hashing {count} files ({size:.1f} MB) from '{dir_path}'\n"
+BENCH_RESULT = "- {algorithm:<14}{throughput:>10.1f} MB/s\n"
+BENCH_VERIFY_NOTE = (
+    "(+verify includes comparing every file byte by byte, the cost if all checksums collide)\n"
+)
+CACHE_PRUNED = "Removed {count} cached hashes from '{path}', {remaining} left\n"
 
 DIRS_DIFF = DELIMITER + "Diff '{left}' -- '{right}':\n"
 DELIM_LIST = "{delimiter}{list}\n"
@@ -40,10 +66,20 @@ DIFF_FILES = f"- Differing files{DELIM_LIST}"
 TROUBLE_FILES = f"- Trouble with common files{DELIM_LIST}"
 COMMON_SUBDIRS = f"- Common subdirectories{DELIM_LIST}"
 COMMON_TROUBLE = f"- Common problematic cases{DELIM_LIST}"
+DIRS_MOVES = DELIMITER + "Moves '{left}' -- '{right}':\n"
+MOVED_FILES = f"- Moved or renamed files{DELIM_LIST}"
+NO_MOVES = "- No moved or renamed files\n"
+MOVE_ENTRY = "{left} -> {right}"
+MOVE_STATUS = "moved_to:{path}"
+MOVES_NEED_DIRS = "Moves are detected between directories only, not manifests\n"
 
 BAD_OPTS = "Mutually exclusive flags: {flags}\n"
+MISSING_PATTERN = "Expected <name> or at least one --pattern / --patterns-file\n"
 BAD_LITERAL = """'{value}'. Expected literal of list of string params e.g. '["x", "y"]'\n"""
 IDENTICAL_PATHS = "Paths are identical\n"
+INVALID_SIZE = "'{value}'. Expected size in bytes with optional unit K, M, G or T e.g. 512M"
+INVALID_TIME = "'{value}'. Expected age with unit s, m, h, d or w e.g. 90d or ISO date e.g. 2024-01-31"
+INVALID_SORT_CRITERIA = "'{value}'. Expected single or multiple criteria separated by comma: {choices}"
 
 UNSUPPORTED_TYPE_ERROR = "Unsupported file type: '{value}'"
 MISSING_CONFIG_ERROR = "Config file not found: '{path}'"
@@ -1,26 +1,24 @@
-import logging
+import atexit
 import os.path
 
-from file_manager.logs import log_messages
+from file_manager.logs.output_sink import OutputSink
 
+_sink: OutputSink | None = None
 
-def get_logger(output_dir: str, save_output: bool, log_name: str) -> logging.Logger:
-    logger = logging.getLogger()
-    stream_handler = logging.StreamHandler()
-    stream_handler.terminator = ""
-    formatter = logging.Formatter(log_messages.LOG_FORMAT)
-    stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
 
-    if save_output:
-        log_file = os.path.join(os.path.abspath(output_dir), log_name)
-        if os.path.exists(log_file):
-            os.remove(log_file)
+def get_logger(output_dir: str, save_output: bool, log_name: str) -> OutputSink:
+    global _sink
+    log_file = os.path.join(os.path.abspath(output_dir), log_name) if save_output else None
+    # NB: reuse the sink of the running command -> every message is written exactly once
+    if _sink is None or _sink.log_file != log_file:
+        close_logger()
+        _sink = OutputSink(log_file)
+    return _sink
 
-        file_handler = logging.FileHandler(filename=log_file, mode="a")
-        file_handler.terminator = ""
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
 
-    logger.setLevel(logging.INFO)
-    return logger
+@atexit.register
+def close_logger() -> None:
+    global _sink
+    if _sink:
+        _sink.close()
+        _sink = None
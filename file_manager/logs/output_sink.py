@@ -0,0 +1,82 @@
+import gzip
+import os
+import sys
+from typing import TextIO
+
+# NB: messages are joined and written in large blocks -> one write syscall per block instead of per line
+BUFFER_SIZE = 1024 * 1024
+COMPRESSED_SUFFIX = ".gz"
+
+
+class OutputSink:
+    def __init__(self, log_file: str | None = None, buffer_size: int = BUFFER_SIZE) -> None:
+        self.log_file = log_file
+        self.buffer_size = buffer_size
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._file: TextIO | None = None
+        # NB: someone watches a terminal -> every message shows up right away, large blocks only for
+        # pipes and files
+        self._is_interactive = _is_terminal(sys.stdout)
+        if log_file:
+            if os.path.exists(log_file):
+                os.remove(log_file)
+            self._file = _open_log_file(log_file)
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def info(self, msg: str) -> None:
+        self._buffer.append(msg)
+        self._buffered += len(msg)
+        if self._buffered >= self.buffer_size or self._is_interactive:
+            self.flush()
+
+    # file-like alias -> writers from the standard library (e.g. csv) can write into the sink
+    write = info
+
+    def flush(self) -> None:
+        if self._buffer:
+            data = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            # NB: output (and records) go to stdout so they can be piped, errors stay on stderr
+            # -> looked up on every flush to follow redirections (e.g. click's test runner)
+            _write_stdout(data)
+            if self._file:
+                self._file.write(data)
+        sys.stdout.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def _is_terminal(stream: TextIO) -> bool:
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def _write_stdout(data: str) -> None:
+    try:
+        sys.stdout.write(data)
+    except UnicodeEncodeError:
+        # NB: names that aren't valid UTF-8 are decoded with surrogates -> written as their original bytes
+        if not (buffer := getattr(sys.stdout, "buffer", None)):
+            sys.stdout.write(data.encode("utf-8", "backslashreplace").decode("utf-8"))
+            return
+        sys.stdout.flush()
+        buffer.write(data.encode(sys.stdout.encoding or "utf-8", "surrogateescape"))
+
+
+def _open_log_file(log_file: str) -> TextIO:
+    if log_file.endswith(COMPRESSED_SUFFIX):
+        return gzip.open(log_file, "wt", encoding="utf-8", errors="surrogateescape")
+    return open(log_file, "w", encoding="utf-8", errors="surrogateescape", buffering=BUFFER_SIZE)
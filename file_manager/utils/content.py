@@ -0,0 +1,97 @@
+import mmap
+import os
+import re
+from collections import deque
+from collections.abc import Generator, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import TypeAlias
+
+# NUL bytes hardly ever show up in text -> their presence in the first block marks a file as binary
+SNIFF_SIZE = 8192
+# longer lines (e.g. minified files) are cut in the report
+MAX_LINE_LENGTH = 1024
+# NB: slicing an mmap copies the bytes -> newlines are counted over slices of bounded size
+COUNT_CHUNK_SIZE = 1024 * 1024
+# NB: most files are small -> handing them to the workers in batches saves one round trip per file
+FILES_PER_TASK = 32
+# batches handed out ahead of the one being reported -> keeps every worker busy with bounded memory
+TASKS_PER_WORKER = 4
+
+Hit: TypeAlias = tuple[int, int, bytes]
+
+
+def compile_pattern(patterns: list[str], use_regex: bool) -> re.Pattern[bytes]:
+    sources = [pattern.encode(errors="surrogateescape") for pattern in patterns]
+    if not use_regex:
+        sources = [re.escape(source) for source in sources]
+    # NB: hits are reported per line -> ^ and $ anchor at every line like in grep
+    if len(sources) == 1:
+        return re.compile(sources[0], re.MULTILINE)
+    return re.compile(b"|".join(b"(?:" + source + b")" for source in sources), re.MULTILINE)
+
+
+def search_files(
+    paths: Iterable[str], pattern: re.Pattern[bytes], max_count: int | None = None, jobs: int = 1
+) -> Generator[tuple[str, list[Hit]]]:
+    func = partial(search_file, pattern=pattern, max_count=max_count)
+    if jobs == 1:
+        for path in paths:
+            yield path, func(path)
+        return
+
+    # NB: re holds the GIL while matching -> scan files in processes; results are reported in walk order
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        paths = iter(paths)
+        while batch := list(islice(paths, FILES_PER_TASK)):
+            pending.append((batch, executor.submit(_search_batch, batch, pattern, max_count)))
+            if len(pending) >= jobs * TASKS_PER_WORKER:
+                batch, future = pending.popleft()
+                yield from zip(batch, future.result())
+        while pending:
+            batch, future = pending.popleft()
+            yield from zip(batch, future.result())
+
+
+def _search_batch(paths: list[str], pattern: re.Pattern[bytes], max_count: int | None) -> list[list[Hit]]:
+    return [search_file(path, pattern, max_count) for path in paths]
+
+
+def search_file(path: str, pattern: re.Pattern[bytes], max_count: int | None = None) -> list[Hit]:
+    try:
+        with open(path, "rb") as f:
+            if b"\0" in f.read(SNIFF_SIZE) or not os.fstat(f.fileno()).st_size:
+                return []
+            # the page cache backs the mapping -> the regex runs over the whole file without copying it
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return _find_hits(data, pattern, max_count)
+    except (OSError, ValueError):
+        return []
+
+
+def _find_hits(data: mmap.mmap, pattern: re.Pattern[bytes], max_count: int | None) -> list[Hit]:
+    hits = []
+    line_no = 1
+    counted_pos = 0
+    pos = 0
+    while match := pattern.search(data, pos):
+        line_start = data.rfind(b"\n", 0, match.start()) + 1
+        if (line_end := data.find(b"\n", match.start())) == -1:
+            line_end = len(data)
+        line_no += _count_newlines(data, counted_pos, line_start)
+        counted_pos = line_start
+        hits.append((line_no, match.start(), data[line_start : min(line_end, line_start + MAX_LINE_LENGTH)]))
+        if max_count and len(hits) >= max_count:
+            break
+        # one hit per line -> continue on the next one
+        pos = line_end + 1
+    return hits
+
+
+def _count_newlines(data: mmap.mmap, start: int, end: int) -> int:
+    return sum(
+        data[pos : min(pos + COUNT_CHUNK_SIZE, end)].count(b"\n")
+        for pos in range(start, end, COUNT_CHUNK_SIZE)
+    )
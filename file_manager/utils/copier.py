@@ -0,0 +1,105 @@
+import errno
+import os
+import shutil
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# NB: copy_file_range fails with these if the file systems or kernel can't copy in place -> try sendfile
+UNSUPPORTED_ERRORS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
+# bytes handed to the kernel per call -> large enough for few syscalls, small enough to stay responsive
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+# copies queued per worker before waiting for the oldest one -> bounded number of pending tasks
+PENDING_PER_WORKER = 4
+
+
+class CopyPool:
+    def __init__(self, jobs: int = 1) -> None:
+        self.jobs = jobs
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: deque[Future] = deque()
+
+    def __enter__(self) -> "CopyPool":
+        if self.jobs > 1:
+            # NB: the data is copied by the kernel -> threads only wait on syscalls and run in parallel
+            self._executor = ThreadPoolExecutor(max_workers=self.jobs)
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if not self._executor:
+            return
+        try:
+            # raise errors of the remaining copies unless the sync failed already
+            while exc_type is None and self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def copy(self, source: str, target: str) -> None:
+        if not self._executor:
+            copy_file(source, target)
+            return
+        self._pending.append(self._executor.submit(copy_file, source, target))
+        if len(self._pending) >= self.jobs * PENDING_PER_WORKER:
+            self._pending.popleft().result()
+
+
+def copy_file(source: str, target: str) -> None:
+    # NB: write the copy under a temp name next to target and rename it over target
+    # -> target is always either the old file or the complete copy, never a partial one
+    temp_path = os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(source, "rb") as src, open(temp_path, "xb") as dst:
+            stat_result = os.fstat(src.fileno())
+            _copy_data(src.fileno(), dst.fileno(), stat_result.st_size)
+        shutil.copymode(source, temp_path)
+        # same mtime as source -> the next run sees an equal stat signature and skips the file
+        os.utime(temp_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.lexists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _copy_data(src_fd: int, dst_fd: int, size: int) -> None:
+    # the data stays in the kernel (and may even be cloned by the file system) -> no copy through userspace
+    offset = _copy_file_range(src_fd, dst_fd, size) if hasattr(os, "copy_file_range") else 0
+    if offset < size:
+        offset = _sendfile(src_fd, dst_fd, offset, size)
+    if offset < size:
+        os.lseek(src_fd, offset, os.SEEK_SET)
+        os.lseek(dst_fd, offset, os.SEEK_SET)
+        with open(src_fd, "rb", closefd=False) as src, open(dst_fd, "wb", closefd=False) as dst:
+            shutil.copyfileobj(src, dst)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> int:
+    offset = 0
+    while offset < size:
+        try:
+            copied = os.copy_file_range(src_fd, dst_fd, min(COPY_CHUNK_SIZE, size - offset))
+        except OSError as e:
+            if e.errno in UNSUPPORTED_ERRORS and offset == 0:
+                return offset
+            raise
+        if not copied:
+            # file got shorter while copying -> the rest is copied by the fallbacks
+            break
+        offset += copied
+    return offset
+
+
+def _sendfile(src_fd: int, dst_fd: int, offset: int, size: int) -> int:
+    while offset < size:
+        try:
+            copied = os.sendfile(dst_fd, src_fd, offset, min(COPY_CHUNK_SIZE, size - offset))
+        except OSError as e:
+            if e.errno in UNSUPPORTED_ERRORS:
+                return offset
+            raise
+        if not copied:
+            break
+        offset += copied
+    return offset
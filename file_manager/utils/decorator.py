@@ -1,9 +1,18 @@
 import os
+import re
+import time
+from datetime import datetime
 from typing import Callable, Any, TypeAlias
 
 import click
 
+from file_manager.logs import log_messages
+from file_manager.utils import records
+
 ClickCallable: TypeAlias = Callable[[Any, ...], None]
+SORT_CRITERIA = ["name", "size", "date", "modified", "type"]
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+AGE_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60, "w": 7 * 24 * 60 * 60}
 
 
 def save_logs(func: ClickCallable) -> ClickCallable:
@@ -19,7 +28,7 @@ def save_logs(func: ClickCallable) -> ClickCallable:
         "--log",
         type=click.STRING,
         default=lambda: f"{func.__name__}.log",
-        help="Saved log file name",
+        help="Saved log file name. Compressed with gzip if it ends with .gz",
     )
     return save(output(log(func)))
 
@@ -27,15 +36,68 @@ def save_logs(func: ClickCallable) -> ClickCallable:
 def sort_order_results(func: ClickCallable) -> ClickCallable:
     sort = click.option(
         "--sort",
-        type=click.Choice(["name", "size", "date", "modified", "type"], case_sensitive=False),
-        help="Sorting criteria",
+        type=click.STRING,
+        callback=_validate_sort_criteria,
+        metavar="[name|size|date|modified|type]",
+        help="Sorting criteria. Multiple keys are separated by comma e.g. --sort type,size",
     )
     desc = click.option(
         "--desc",
         is_flag=True,
         help="Display result in descending order",
     )
-    return sort(desc(func))
+    limit = click.option(
+        "--limit",
+        type=click.IntRange(1),
+        default=None,
+        help="Display only the first N entries according to the sorting criteria",
+    )
+    unsorted = click.option(
+        "-U",
+        "--unsorted",
+        is_flag=True,
+        help="List entries in directory order while reading them (fast on huge dirs)",
+    )
+    return sort(desc(limit(unsorted(func))))
+
+
+def _validate_sort_criteria(ctx: click.Context, param: click.Parameter, value: str | None) -> str | None:
+    if value is None:
+        return None
+    criteria = [key.strip().lower() for key in value.split(",")]
+    if invalid := [key for key in criteria if key not in SORT_CRITERIA]:
+        raise click.BadParameter(
+            log_messages.INVALID_SORT_CRITERIA.format(
+                value=",".join(invalid), choices="|".join(SORT_CRITERIA)
+            )
+        )
+    return ",".join(criteria)
+
+
+class ByteSize(click.ParamType):
+    name = "size"
+
+    def convert(self, value: Any, param: click.Parameter | None, ctx: click.Context | None) -> int:
+        if isinstance(value, int):
+            return value
+        if not (match := re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KMGT]?)B?", value.strip(), re.IGNORECASE)):
+            self.fail(log_messages.INVALID_SIZE.format(value=value), param, ctx)
+        return int(float(match[1]) * SIZE_UNITS[match[2].upper()])
+
+
+class PointInTime(click.ParamType):
+    name = "time"
+
+    def convert(self, value: Any, param: click.Parameter | None, ctx: click.Context | None) -> float:
+        if isinstance(value, float):
+            return value
+        # an age like 90d is counted back from now, anything else is read as an ISO date
+        if match := re.fullmatch(r"(\d+(?:\.\d+)?)\s*([smhdw])", value.strip(), re.IGNORECASE):
+            return time.time() - float(match[1]) * AGE_UNITS[match[2].lower()]
+        try:
+            return datetime.fromisoformat(value.strip()).timestamp()
+        except ValueError:
+            self.fail(log_messages.INVALID_TIME.format(value=value), param, ctx)
 
 
 def create_backup(func: ClickCallable) -> ClickCallable:
@@ -72,3 +134,25 @@ def show_hidden_entries(func: ClickCallable) -> ClickCallable:
         is_flag=True,
         help="Include hidden entries paths",
     )(func)
+
+
+def parallel_jobs(func: ClickCallable) -> ClickCallable:
+    return click.option(
+        "-j",
+        "--jobs",
+        type=click.IntRange(1),
+        default=1,
+        show_default=True,
+        help="Number of parallel workers",
+    )(func)
+
+
+def structured_output(func: ClickCallable) -> ClickCallable:
+    return click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(records.OUTPUT_FORMATS, case_sensitive=False),
+        default=records.TEXT,
+        show_default=True,
+        help="Print readable text or one record per entry (path, type, size, mtime, status)",
+    )(func)
@@ -0,0 +1,114 @@
+import os
+import stat
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+
+from file_manager.utils import hasher, should_skip_hidden, walker
+
+
+class ContentComparer:
+    def __init__(self, jobs: int = 1, chunk_size: int = hasher.CHUNK_SIZE) -> None:
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+        self._executor: ThreadPoolExecutor | None = None
+
+    def __enter__(self) -> "ContentComparer":
+        if self.jobs > 1:
+            # NB: hashlib releases the GIL on large updates -> threads hash files in parallel
+            self._executor = ThreadPoolExecutor(max_workers=self.jobs)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def compare(self, pairs: list[tuple[str, str]]) -> list[bool | None]:
+        # True -> same content, False -> different, None -> could not be read
+        paths = [path for pair in pairs for path in pair]
+        if self._executor and len(paths) > 1:
+            digests = list(self._executor.map(self._hash, paths))
+        else:
+            digests = list(map(self._hash, paths))
+        return [
+            None if left is None or right is None else left == right
+            for left, right in zip(digests[::2], digests[1::2])
+        ]
+
+    def _hash(self, path: str) -> str | None:
+        try:
+            return hasher.hash_file(path, self.chunk_size)
+        except OSError:
+            return None
+
+
+class DeepDirCmp:
+    # same result attributes as filecmp.dircmp -> reports don't tell the two apart
+    # but common files are compared by size and content instead of their stat signature
+    def __init__(self, left: str, right: str, ignore: list[str], comparer: ContentComparer) -> None:
+        self.left = left
+        self.right = right
+        left_entries = _list_side(left, ignore)
+        right_entries = _list_side(right, ignore)
+        self.left_only = sorted(left_entries.keys() - right_entries.keys())
+        self.right_only = sorted(right_entries.keys() - left_entries.keys())
+
+        self.common_dirs = []
+        self.common_funny = []
+        self.same_files = []
+        self.diff_files = []
+        self.funny_files = []
+        pending = []
+        for name in sorted(left_entries.keys() & right_entries.keys()):
+            left_stat = _get_stat(left_entries[name])
+            right_stat = _get_stat(right_entries[name])
+            if left_stat is None or right_stat is None:
+                self.common_funny.append(name)
+            elif stat.S_ISDIR(left_stat.st_mode) and stat.S_ISDIR(right_stat.st_mode):
+                self.common_dirs.append(name)
+            elif not (stat.S_ISREG(left_stat.st_mode) and stat.S_ISREG(right_stat.st_mode)):
+                self.common_funny.append(name)
+            elif left_stat.st_size != right_stat.st_size:
+                # NB: different sizes -> different content without reading a byte
+                self.diff_files.append(name)
+            else:
+                pending.append(name)
+
+        pairs = [(left_entries[name].path, right_entries[name].path) for name in pending]
+        for name, is_same in zip(pending, comparer.compare(pairs)):
+            if is_same is None:
+                self.funny_files.append(name)
+            else:
+                (self.same_files if is_same else self.diff_files).append(name)
+        # results are sorted by name like the ones of dircmp
+        self.diff_files.sort()
+
+
+def walk_deep_diff(
+    left: str, right: str, ignore: list[str], show_hidden: bool, recursively: bool, jobs: int = 1
+) -> Generator[DeepDirCmp]:
+    def get_subdirs(cmp_obj: DeepDirCmp) -> list[tuple[str, str]]:
+        if not recursively:
+            return []
+        return [
+            (os.path.join(cmp_obj.left, name), os.path.join(cmp_obj.right, name))
+            for name in cmp_obj.common_dirs
+            if not should_skip_hidden(show_hidden, name)
+        ]
+
+    with ContentComparer(jobs) as comparer:
+        # NB: dir pairs are compared by the walker workers while earlier ones are being reported
+        yield from walker.walk_tree(
+            (left, right), lambda pair: DeepDirCmp(*pair, ignore, comparer), get_subdirs, jobs
+        )
+
+
+def _list_side(dir_path: str, ignore: list[str]) -> dict[str, os.DirEntry]:
+    return {entry.name: entry for entry in walker.iter_entries(dir_path) if entry.name not in ignore}
+
+
+def _get_stat(entry: os.DirEntry) -> os.stat_result | None:
+    try:
+        return entry.stat()
+    except OSError:
+        return None
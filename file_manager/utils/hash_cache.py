@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import time
+
+CACHE_DIR_NAME = "command-line-file-manager"
+CACHE_FILE_NAME = "hashes.sqlite"
+SECONDS_PER_DAY = 24 * 60 * 60
+# NB: bumped whenever the key changes -> caches of older versions are dropped instead of trusted
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ctime_ns INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    path BLOB NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (dev, ino, size, mtime_ns, ctime_ns, algorithm)
+) WITHOUT ROWID
+"""
+
+
+class HashCache:
+    def __init__(self, cache_path: str | None = None) -> None:
+        self.cache_path = cache_path or get_cache_path()
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.cache_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS hashes")
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.execute(SCHEMA)
+        self._now = int(time.time())
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def get(self, stat: os.stat_result, algorithm: str) -> str | None:
+        key = _get_key(stat, algorithm)
+        row = self._conn.execute(
+            "SELECT digest FROM hashes WHERE dev=? AND ino=? AND size=? AND mtime_ns=? AND ctime_ns=? AND algorithm=?",
+            key,
+        ).fetchone()
+        if not row:
+            return None
+        self._conn.execute(
+            "UPDATE hashes SET last_used=? WHERE dev=? AND ino=? AND size=? AND mtime_ns=? AND ctime_ns=? AND algorithm=?",
+            (self._now, *key),
+        )
+        return row[0]
+
+    def put(self, path: str, stat: os.stat_result, algorithm: str, digest: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            # NB: stored as raw bytes -> names that are not valid UTF-8 round-trip unchanged
+            (*_get_key(stat, algorithm), digest, os.fsencode(path), self._now),
+        )
+
+    def prune(self, max_age: int | None = None) -> int:
+        # evict records of files that were removed or changed since they were hashed...
+        stale = []
+        for *key, path in self._conn.execute(
+            "SELECT dev, ino, size, mtime_ns, ctime_ns, algorithm, path FROM hashes"
+        ):
+            try:
+                stat = os.stat(os.fsdecode(path))
+            except OSError:
+                stale.append(key)
+                continue
+            if tuple(key) != _get_key(stat, key[-1]):
+                stale.append(key)
+        self._conn.executemany(
+            "DELETE FROM hashes WHERE dev=? AND ino=? AND size=? AND mtime_ns=? AND ctime_ns=? AND algorithm=?",
+            stale,
+        )
+        removed = len(stale)
+        # ...and those not used for the given number of days
+        if max_age is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM hashes WHERE last_used < ?", (self._now - max_age * SECONDS_PER_DAY,)
+            )
+            removed += cursor.rowcount
+        self._conn.commit()
+        return removed
+
+    def clear(self) -> int:
+        cursor = self._conn.execute("DELETE FROM hashes")
+        self._conn.commit()
+        return cursor.rowcount
+
+    def vacuum(self) -> None:
+        self._conn.commit()
+        self._conn.execute("VACUUM")
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+
+def get_cache_path() -> str:
+    return os.path.join(get_cache_dir(), CACHE_FILE_NAME)
+
+
+def get_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, CACHE_DIR_NAME)
+
+
+def _get_key(stat: os.stat_result, algorithm: str) -> tuple[int, int, int, int, int, str]:
+    # NB: mtime can be set back (e.g. touch -r) but every change of content or mtime updates ctime
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns, algorithm
@@ -0,0 +1,162 @@
+import filecmp
+import hashlib
+import os
+import threading
+import zlib
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from file_manager.utils.hash_cache import HashCache
+
+CHUNK_SIZE = 1024 * 1024
+# bytes read from both ends of a file to tell apart equally sized files before hashing all of them
+SAMPLE_SIZE = 4096
+ALGORITHM = "sha1"
+# NB: crc32 is cheap but collides easily -> equal checksums are confirmed by comparing the files
+VERIFIED_ALGORITHMS = {"crc32+verify"}
+
+_local = threading.local()
+
+
+class Crc32:
+    def __init__(self) -> None:
+        self._value = 0
+
+    def update(self, data: bytes | memoryview) -> None:
+        self._value = zlib.crc32(data, self._value)
+
+    def hexdigest(self) -> str:
+        return f"{self._value:08x}"
+
+
+HASH_MAP = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    # truncated digest -> still far more than enough bits to tell files apart
+    "blake2b": partial(hashlib.blake2b, digest_size=16),
+    "crc32+verify": Crc32,
+}
+
+
+class HashPool:
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        jobs: int = 1,
+        use_processes: bool = False,
+        use_cache: bool = False,
+        algorithm: str = ALGORITHM,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.jobs = jobs
+        self.use_processes = use_processes
+        self.use_cache = use_cache
+        self.algorithm = algorithm
+        self.needs_verify = algorithm in VERIFIED_ALGORITHMS
+        self._executor: Executor | None = None
+        self._cache: HashCache | None = None
+
+    def __enter__(self) -> "HashPool":
+        if self.use_cache:
+            self._cache = HashCache()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if self._cache:
+            self._cache.close()
+            self._cache = None
+
+    def hash_files(self, paths: list[str], stats: list[os.stat_result]) -> list[str]:
+        func = partial(hash_file, chunk_size=self.chunk_size, algorithm=self.algorithm)
+        return self._map_cached(self.algorithm, func, paths, stats)
+
+    def hash_samples(self, paths: list[str], stats: list[os.stat_result]) -> list[str]:
+        sizes = [stat.st_size for stat in stats]
+        func = partial(hash_sample, algorithm=self.algorithm)
+        return self._map_cached(f"{self.algorithm}-sample-{SAMPLE_SIZE}", func, paths, stats, sizes)
+
+    def _map_cached(
+        self,
+        algorithm: str,
+        func: Callable[..., str],
+        paths: list[str],
+        stats: list[os.stat_result],
+        *args: list,
+    ) -> list[str]:
+        if not self._cache:
+            return self._map(func, paths, *args)
+
+        # NB: unchanged files are served from the cache without being opened at all
+        digests = [self._cache.get(stat, algorithm) for stat in stats]
+        missing = [idx for idx, digest in enumerate(digests) if digest is None]
+        if not missing:
+            return digests
+
+        computed = self._map(
+            func, [paths[idx] for idx in missing], *([arg[idx] for idx in missing] for arg in args)
+        )
+        for idx, digest in zip(missing, computed):
+            digests[idx] = digest
+            self._cache.put(paths[idx], stats[idx], algorithm, digest)
+        return digests
+
+    def _map(self, func: Callable[..., str], paths: list[str], *args: list) -> list[str]:
+        # NB: results keep the order of paths -> reports don't depend on which worker finished first
+        if self.jobs == 1 or len(paths) < 2:
+            return list(map(func, paths, *args))
+        if not self._executor:
+            pool_cls = ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            self._executor = pool_cls(max_workers=self.jobs)
+        chunks = max(1, len(paths) // (self.jobs * 4))
+        return list(self._executor.map(func, paths, *args, chunksize=chunks))
+
+
+def hash_file(path: str, chunk_size: int = CHUNK_SIZE, algorithm: str = ALGORITHM) -> str:
+    sha = HASH_MAP[algorithm]()
+    buffer = _get_buffer(chunk_size)
+    # NB: unbuffered readinto a preallocated buffer -> constant memory and no bytes object per chunk
+    with open(path, "rb", buffering=0) as f:
+        while size := f.readinto(buffer):
+            sha.update(buffer[:size])
+    return sha.hexdigest()
+
+
+def hash_sample(path: str, size: int, algorithm: str = ALGORITHM) -> str:
+    sha = HASH_MAP[algorithm]()
+    buffer = _get_buffer(SAMPLE_SIZE)
+    with open(path, "rb", buffering=0) as f:
+        sha.update(buffer[: f.readinto(buffer)])
+        if size > SAMPLE_SIZE:
+            f.seek(max(size - SAMPLE_SIZE, SAMPLE_SIZE))
+            sha.update(buffer[: f.readinto(buffer)])
+    return sha.hexdigest()
+
+
+def split_by_content(paths: list[str]) -> list[list[str]]:
+    # compare each file to the first one of every group found so far
+    groups = []
+    for path in paths:
+        for group in groups:
+            if filecmp.cmp(group[0], path, shallow=False):
+                group.append(path)
+                break
+        else:
+            groups.append([path])
+    return groups
+
+
+def is_sampled(size: int) -> bool:
+    # small files are read whole by the sample anyway -> hash them fully right away
+    return size > 2 * SAMPLE_SIZE
+
+
+def _get_buffer(chunk_size: int = CHUNK_SIZE) -> memoryview:
+    # one buffer per thread, reallocated only if a larger chunk size is requested
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None or len(buffer) < chunk_size:
+        buffer = _local.buffer = memoryview(bytearray(chunk_size))
+    return buffer[:chunk_size]
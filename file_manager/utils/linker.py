@@ -0,0 +1,63 @@
+import errno
+import filecmp
+import os
+import shutil
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows -> reflinks are reported as unsupported
+    fcntl = None
+
+HARD_LINK = "hard"
+REFLINK = "reflink"
+LINK_TYPES = [HARD_LINK, REFLINK]
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+UNSUPPORTED_ERRORS = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EPERM}
+
+
+class LinkNotSupportedError(OSError):
+    pass
+
+
+def is_same_content(source: str, target: str) -> bool:
+    return filecmp.cmp(source, target, shallow=False)
+
+
+def link_duplicate(source: str, target: str, link_type: str) -> None:
+    # NB: build the link under a temp name next to target and rename it over target
+    # -> target is always either the old file or the complete link, never missing
+    temp_path = os.path.join(os.path.dirname(target), f".{os.path.basename(target)}.{uuid.uuid4().hex}.tmp")
+    try:
+        if link_type == HARD_LINK:
+            _hard_link(source, temp_path)
+        else:
+            _reflink(source, temp_path)
+            shutil.copystat(target, temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.lexists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _hard_link(source: str, target: str) -> None:
+    try:
+        os.link(source, target)
+    except OSError as e:
+        if e.errno in UNSUPPORTED_ERRORS:
+            raise LinkNotSupportedError(e.errno, e.strerror) from e
+        raise
+
+
+def _reflink(source: str, target: str) -> None:
+    if fcntl is None:
+        raise LinkNotSupportedError(errno.ENOSYS, os.strerror(errno.ENOSYS))
+    with open(source, "rb") as src, open(target, "xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError as e:
+            if e.errno in UNSUPPORTED_ERRORS:
+                raise LinkNotSupportedError(e.errno, e.strerror) from e
+            raise
@@ -0,0 +1,224 @@
+import gzip
+import json
+import os
+from collections.abc import Generator, Iterator
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from typing import TextIO, TypeAlias
+
+from file_manager.logs.output_sink import BUFFER_SIZE, COMPRESSED_SUFFIX
+from file_manager.utils import hasher, should_skip_hidden, walker
+
+MANIFEST_VERSION = 1
+FILE_TYPE = "f"
+DIR_TYPE = "d"
+OTHER_TYPE = "o"
+
+# (dir path relative to the root with '/' separators, name, type, size, mtime_ns, digest)
+# NB: records are grouped by dir and dirs come in pre-order with sorted names on every level
+# -> two manifests are compared by a single merge over both files
+Record: TypeAlias = tuple[str, str, str, int | None, int | None, str | None]
+
+
+class TreeSource:
+    # a live dir or a manifest written by write_manifest() -> both yield the same records
+    def __init__(self, path: str, jobs: int = 1) -> None:
+        self.path = os.path.abspath(path)
+        self.is_manifest = os.path.isfile(self.path)
+        if self.is_manifest:
+            self._file = _open_manifest(self.path, "r")
+            header = json.loads(self._file.readline())
+            self.algorithm = header.get("hash")
+        else:
+            self._file = None
+            self.algorithm = None
+        self.jobs = jobs
+
+    def __enter__(self) -> "TreeSource":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._file:
+            self._file.close()
+
+    def iter_records(self) -> Generator[Record]:
+        if not self.is_manifest:
+            yield from iter_dir_records(self.path, jobs=self.jobs)
+            return
+        for line in self._file:
+            yield tuple(json.loads(line))
+
+    def get_display_path(self, rel_dir: str) -> str:
+        return os.path.join(self.path, rel_dir) if rel_dir else self.path
+
+    def get_digest(self, record: Record, algorithm: str) -> str | None:
+        if record[5] and self.algorithm == algorithm:
+            return record[5]
+        if self.is_manifest:
+            return None
+        try:
+            return hasher.hash_file(os.path.join(self.path, record[0], record[1]), algorithm=algorithm)
+        except OSError:
+            return None
+
+
+class ManifestDirCmp:
+    # same result attributes as filecmp.dircmp -> reports don't tell the two apart
+    def __init__(
+        self,
+        left_source: TreeSource,
+        right_source: TreeSource,
+        rel_dir: str,
+        left_records: list[Record],
+        right_records: list[Record],
+        ignore: list[str],
+    ) -> None:
+        self.rel_dir = rel_dir
+        self.left = left_source.get_display_path(rel_dir)
+        self.right = right_source.get_display_path(rel_dir)
+        left_map = {record[1]: record for record in left_records if record[1] not in ignore}
+        right_map = {record[1]: record for record in right_records if record[1] not in ignore}
+        self.left_only = sorted(left_map.keys() - right_map.keys())
+        self.right_only = sorted(right_map.keys() - left_map.keys())
+
+        self.common_dirs = []
+        self.common_funny = []
+        self.same_files = []
+        self.diff_files = []
+        self.funny_files = []
+        for name in sorted(left_map.keys() & right_map.keys()):
+            left_record = left_map[name]
+            right_record = right_map[name]
+            if left_record[2] == right_record[2] == DIR_TYPE:
+                self.common_dirs.append(name)
+            elif not left_record[2] == right_record[2] == FILE_TYPE:
+                self.common_funny.append(name)
+            elif _is_same_file(left_source, right_source, left_record, right_record):
+                self.same_files.append(name)
+            else:
+                self.diff_files.append(name)
+
+
+def write_manifest(dir_path: str, manifest_path: str, algorithm: str | None = None, jobs: int = 1) -> int:
+    count = 0
+    with _open_manifest(manifest_path, "w") as f:
+        header = {"version": MANIFEST_VERSION, "root": os.path.abspath(dir_path), "hash": algorithm}
+        f.write(json.dumps(header) + "\n")
+        # NB: records are written while the walk goes on -> memory holds a few listings per job at a time
+        for record in iter_dir_records(dir_path, algorithm, jobs):
+            f.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+def iter_dir_records(dir_path: str, algorithm: str | None = None, jobs: int = 1) -> Generator[Record]:
+    list_dir = partial(_list_records, root_dir=dir_path, algorithm=algorithm)
+    for listing in walker.walk_tree("", list_dir, itemgetter(1), jobs):
+        yield from listing[0]
+
+
+def walk_manifest_diff(
+    left_source: TreeSource,
+    right_source: TreeSource,
+    ignore: list[str],
+    show_hidden: bool,
+    recursively: bool,
+) -> Generator[ManifestDirCmp]:
+    left_groups = groupby(left_source.iter_records(), key=itemgetter(0))
+    right_groups = groupby(right_source.iter_records(), key=itemgetter(0))
+    left_group = next(left_groups, None)
+    right_group = next(right_groups, None)
+
+    # the dirs to report come in the same pre-order as the groups of records
+    # -> groups before the next expected dir belong to dirs on one side only and are skipped
+    dir_stack = [""]
+    while dir_stack:
+        rel_dir = dir_stack.pop()
+        dir_key = _get_dir_key(rel_dir)
+        left_records, left_group = _take_group(left_groups, left_group, dir_key)
+        right_records, right_group = _take_group(right_groups, right_group, dir_key)
+        cmp_obj = ManifestDirCmp(left_source, right_source, rel_dir, left_records, right_records, ignore)
+        yield cmp_obj
+        if recursively:
+            dir_stack.extend(
+                f"{rel_dir}/{name}" if rel_dir else name
+                for name in reversed(cmp_obj.common_dirs)
+                if not should_skip_hidden(show_hidden, name)
+            )
+
+
+def _take_group(
+    groups: Iterator[tuple[str, Iterator[Record]]],
+    group: tuple[str, Iterator[Record]] | None,
+    dir_key: tuple[str, ...],
+) -> tuple[list[Record], tuple[str, Iterator[Record]] | None]:
+    while group and _get_dir_key(group[0]) < dir_key:
+        group = next(groups, None)
+    if group and _get_dir_key(group[0]) == dir_key:
+        return list(group[1]), next(groups, None)
+    return [], group
+
+
+def _get_dir_key(rel_dir: str) -> tuple[str, ...]:
+    # NB: compared by components -> 'a/b' sorts before 'a.b' like in the walk
+    return tuple(rel_dir.split("/")) if rel_dir else ()
+
+
+def _is_same_file(
+    left_source: TreeSource, right_source: TreeSource, left_record: Record, right_record: Record
+) -> bool:
+    if left_record[3] != right_record[3]:
+        return False
+    if left_record[4] == right_record[4]:
+        return True
+    # equally sized but modified at different times -> compare digests if any side has them
+    if not (algorithm := left_source.algorithm or right_source.algorithm):
+        return False
+    left_digest = left_source.get_digest(left_record, algorithm)
+    right_digest = right_source.get_digest(right_record, algorithm)
+    # NB: no digest on a side (e.g. unreadable file or a manifest without one)
+    # -> falls back to size and mtime like without any digests, which already tell them apart
+    return left_digest is not None and left_digest == right_digest
+
+
+def _list_records(rel_dir: str, root_dir: str, algorithm: str | None) -> tuple[list[Record], list[str]]:
+    dir_path = os.path.join(root_dir, rel_dir)
+    records = []
+    subdirs = []
+    try:
+        entries = sorted(walker.iter_entries(dir_path), key=lambda entry: entry.name)
+    except OSError:
+        return records, subdirs
+    for entry in entries:
+        try:
+            stat_result = entry.stat()
+        except OSError:
+            records.append((rel_dir, entry.name, OTHER_TYPE, None, None, None))
+            continue
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        digest = None
+        if walker.is_dir(entry):
+            entry_type = DIR_TYPE
+            # symlinked dirs are recorded but not followed -> no loops
+            if not entry.is_symlink():
+                subdirs.append(rel_path)
+        elif walker.is_file(entry):
+            entry_type = FILE_TYPE
+            if algorithm:
+                try:
+                    digest = hasher.hash_file(entry.path, algorithm=algorithm)
+                except OSError:
+                    pass
+        else:
+            entry_type = OTHER_TYPE
+        records.append(
+            (rel_dir, entry.name, entry_type, stat_result.st_size, stat_result.st_mtime_ns, digest)
+        )
+    return records, subdirs
+
+
+def _open_manifest(path: str, mode: str) -> TextIO:
+    if path.endswith(COMPRESSED_SUFFIX):
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8", buffering=BUFFER_SIZE)
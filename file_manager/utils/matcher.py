@@ -0,0 +1,44 @@
+import re
+
+
+class NameMatcher:
+    def __init__(self, patterns: list[str], use_regex: bool) -> None:
+        self.patterns = patterns
+        self.use_regex = use_regex
+        sources = patterns if use_regex else [re.escape(pattern) for pattern in patterns]
+        # NB: compiled once -> no regex cache lookup per entry
+        self._regexes = [re.compile(source) for source in sources]
+        self._combined = None
+        # NB: joined patterns share one group numbering -> backreferences (\1, (?P=name)) would point
+        # at groups of another pattern, so patterns with groups are tested one by one
+        if any(regex.groups for regex in self._regexes):
+            return
+        try:
+            # a single alternation tells in one pass over the name if any of the patterns matches
+            self._combined = re.compile("|".join(f"(?:{source})" for source in sources))
+        except re.error:
+            # e.g. global flags like (?i) inside one of the patterns -> test them one by one
+            pass
+
+    @property
+    def is_multi(self) -> bool:
+        return len(self.patterns) > 1
+
+    def search(self, name: str) -> bool:
+        if not (self.use_regex or self.is_multi):
+            return self.patterns[0] in name
+        if self._combined:
+            return self._combined.search(name) is not None
+        return any(regex.search(name) for regex in self._regexes)
+
+    def get_matches(self, name: str) -> list[str]:
+        # called for hits only -> every pattern is tested again to report all that match
+        return [pattern for pattern, regex in zip(self.patterns, self._regexes) if regex.search(name)]
+
+    def describe(self, name: str) -> str:
+        if not self.is_multi:
+            return name
+        return f"{name} ({', '.join(self.get_matches(name))})"
+
+    def get_status(self, name: str) -> str:
+        return ", ".join(self.get_matches(name))
@@ -0,0 +1,70 @@
+import os
+import stat
+from collections import defaultdict
+from collections.abc import Generator, Iterable
+
+from file_manager.utils import hasher, should_skip_hidden, walker
+
+FileStat = tuple[str, os.stat_result]
+
+
+def iter_only_files(dir_path: str, names: Iterable[str], show_hidden: bool) -> Generator[FileStat]:
+    # entries found on one side only -> their files, including the ones nested inside only dirs
+    dir_stack = []
+    for name in names:
+        if should_skip_hidden(show_hidden, name):
+            continue
+        dir_stack.append(os.path.join(dir_path, name))
+    while dir_stack:
+        path = dir_stack.pop()
+        try:
+            stat_result = os.stat(path, follow_symlinks=False)
+        except OSError:
+            continue
+        if stat.S_ISREG(stat_result.st_mode):
+            yield path, stat_result
+        elif stat.S_ISDIR(stat_result.st_mode):
+            try:
+                dir_stack.extend(
+                    entry.path
+                    for entry in walker.iter_entries(path)
+                    if not should_skip_hidden(show_hidden, entry.name)
+                )
+            except OSError:
+                continue
+
+
+def find_moves(
+    left_files: list[FileStat], right_files: list[FileStat], hash_pool: hasher.HashPool
+) -> list[tuple[str, str]]:
+    left_by_size = _group_by_size(left_files)
+    right_by_size = _group_by_size(right_files)
+    # NB: a file can only have moved to one of the same size -> only sizes found on both sides are hashed
+    candidates = [
+        (left_by_size[size], right_by_size[size])
+        for size in sorted(left_by_size.keys() & right_by_size.keys())
+    ]
+    paths = [path for left_group, right_group in candidates for path, _ in left_group + right_group]
+    stats = [
+        stat_result for left_group, right_group in candidates for _, stat_result in left_group + right_group
+    ]
+    digests = dict(zip(paths, hash_pool.hash_files(paths, stats)))
+
+    moves = []
+    for left_group, right_group in candidates:
+        right_by_digest = defaultdict(list)
+        for path, _ in sorted(right_group, reverse=True):
+            right_by_digest[digests[path]].append(path)
+        for path, _ in sorted(left_group):
+            if targets := right_by_digest.get(digests[path]):
+                moves.append((path, targets.pop()))
+    return sorted(moves)
+
+
+def _group_by_size(files: list[FileStat]) -> dict[int, list[FileStat]]:
+    groups = defaultdict(list)
+    for path, stat_result in files:
+        # NB: empty files all look alike -> never reported as moved
+        if stat_result.st_size:
+            groups[stat_result.st_size].append((path, stat_result))
+    return groups
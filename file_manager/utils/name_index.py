@@ -0,0 +1,305 @@
+import hashlib
+import os
+import re
+import sqlite3
+from collections.abc import Generator
+
+from file_manager.utils import walker
+from file_manager.utils.hash_cache import get_cache_dir
+from file_manager.utils.matcher import NameMatcher
+
+INDEX_DIR_NAME = "indexes"
+TRIGRAM_SIZE = 3
+# NB: every trigram adds one more INTERSECT to the query -> a handful already narrows the candidates down
+MAX_QUERY_TRIGRAMS = 16
+BATCH_SIZE = 10_000
+# NB: bumped whenever the stored types change -> indexes of older versions are rebuilt instead of misread
+SCHEMA_VERSION = 1
+# escape codes followed by a fixed number of hex digits
+ESCAPE_ARGUMENT_LENGTHS = {"x": 2, "u": 4, "U": 8}
+VERBOSE_FLAG_RE = re.compile(r"\(\?[aiLmsu]*x")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    id INTEGER PRIMARY KEY,
+    parent_id INTEGER,
+    path BLOB NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent_id);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    dir_id INTEGER NOT NULL,
+    name BLOB NOT NULL,
+    is_dir INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_dir ON entries (dir_id);
+CREATE TABLE IF NOT EXISTS trigrams (
+    trigram BLOB NOT NULL,
+    entry_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, entry_id)
+) WITHOUT ROWID;
+"""
+
+
+class NameIndex:
+    def __init__(self, index_path: str) -> None:
+        self.index_path = index_path
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.index_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS dirs; DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS trigrams;"
+            )
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "NameIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def update(self, root_dir: str) -> int:
+        # NB: a dir's mtime changes whenever entries are added, removed or renamed inside it
+        # -> dirs with unchanged mtime keep their indexed entries and only their subdirs are visited
+        listed_dirs = 0
+        dir_stack = [(root_dir, None)]
+        while dir_stack:
+            dir_path, parent_id = dir_stack.pop()
+            try:
+                mtime_ns = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                continue
+
+            row = self._conn.execute(
+                "SELECT id, mtime_ns FROM dirs WHERE path=?", (os.fsencode(dir_path),)
+            ).fetchone()
+            if row and row[1] == mtime_ns:
+                subdirs = self._conn.execute("SELECT path FROM dirs WHERE parent_id=?", (row[0],))
+                dir_stack.extend((os.fsdecode(subdir), row[0]) for (subdir,) in subdirs)
+                continue
+
+            try:
+                entries = walker.list_entries(dir_path)
+            except OSError:
+                continue
+            listed_dirs += 1
+            if row:
+                dir_id = row[0]
+                self._conn.execute("UPDATE dirs SET mtime_ns=? WHERE id=?", (mtime_ns, dir_id))
+                self._remove_entries(dir_id)
+            else:
+                cursor = self._conn.execute(
+                    "INSERT INTO dirs (parent_id, path, mtime_ns) VALUES (?, ?, ?)",
+                    (parent_id, os.fsencode(dir_path), mtime_ns),
+                )
+                dir_id = cursor.lastrowid
+            self._add_entries(dir_id, entries)
+
+            # symlinked dirs are indexed by name but not followed -> no loops
+            subdirs = [entry.path for entry in entries if walker.is_dir(entry) and not entry.is_symlink()]
+            kept_subdirs = set(subdirs)
+            for (old_subdir,) in self._conn.execute(
+                "SELECT path FROM dirs WHERE parent_id=?", (dir_id,)
+            ).fetchall():
+                if os.fsdecode(old_subdir) not in kept_subdirs:
+                    self._remove_tree(os.fsdecode(old_subdir))
+            dir_stack.extend((subdir, dir_id) for subdir in reversed(subdirs))
+        self._conn.commit()
+        return listed_dirs
+
+    def count(self) -> tuple[int, int]:
+        dirs = self._conn.execute("SELECT COUNT(*) FROM dirs").fetchone()[0]
+        entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return dirs, entries
+
+    def search(
+        self, dir_path: str, name_matcher: NameMatcher, recursively: bool = True
+    ) -> Generator[tuple[str, str, bool]]:
+        query = "SELECT d.path, e.name, e.is_dir FROM entries e JOIN dirs d ON d.id = e.dir_id"
+        if recursively:
+            query += " WHERE (d.path = ? OR (d.path > ? AND d.path < ?))"
+            params = list(_get_tree_range(dir_path))
+        else:
+            query += " WHERE d.path = ?"
+            params = [os.fsencode(dir_path)]
+        trigram_groups = [
+            sorted(_get_query_trigrams(pattern, name_matcher.use_regex))[:MAX_QUERY_TRIGRAMS]
+            for pattern in name_matcher.patterns
+        ]
+        # a pattern without trigrams may match any name -> then every entry is a candidate
+        if all(trigram_groups):
+            candidates = [
+                "e.id IN ("
+                + " INTERSECT ".join(["SELECT entry_id FROM trigrams WHERE trigram=?"] * len(group))
+                + ")"
+                for group in trigram_groups
+            ]
+            query += " AND (" + " OR ".join(candidates) + ")"
+            params.extend(os.fsencode(trigram) for group in trigram_groups for trigram in group)
+        query += " ORDER BY d.path, e.name"
+
+        # trigrams only narrow down the candidates -> the actual match is checked on every name
+        for entry_dir, entry_name, is_dir in self._conn.execute(query, params):
+            if name_matcher.search(entry_name := os.fsdecode(entry_name)):
+                yield os.fsdecode(entry_dir), entry_name, bool(is_dir)
+
+    def _add_entries(self, dir_id: int, entries: list[os.DirEntry]) -> None:
+        for idx in range(0, len(entries), BATCH_SIZE):
+            postings = []
+            for entry in entries[idx : idx + BATCH_SIZE]:
+                cursor = self._conn.execute(
+                    "INSERT INTO entries (dir_id, name, is_dir) VALUES (?, ?, ?)",
+                    (dir_id, os.fsencode(entry.name), walker.is_dir(entry)),
+                )
+                postings.extend(
+                    (os.fsencode(trigram), cursor.lastrowid) for trigram in get_trigrams(entry.name)
+                )
+            self._conn.executemany("INSERT OR IGNORE INTO trigrams VALUES (?, ?)", postings)
+
+    def _remove_entries(self, dir_id: int) -> None:
+        # postings are keyed by trigram first -> rebuild the keys from the names instead of scanning
+        entries = self._conn.execute("SELECT id, name FROM entries WHERE dir_id=?", (dir_id,)).fetchall()
+        self._conn.executemany(
+            "DELETE FROM trigrams WHERE trigram=? AND entry_id=?",
+            (
+                (os.fsencode(trigram), entry_id)
+                for entry_id, name in entries
+                for trigram in get_trigrams(os.fsdecode(name))
+            ),
+        )
+        self._conn.execute("DELETE FROM entries WHERE dir_id=?", (dir_id,))
+
+    def _remove_tree(self, dir_path: str) -> None:
+        dir_ids = self._conn.execute(
+            "SELECT id FROM dirs WHERE path = ? OR (path > ? AND path < ?)", _get_tree_range(dir_path)
+        ).fetchall()
+        for (dir_id,) in dir_ids:
+            self._remove_entries(dir_id)
+        self._conn.executemany("DELETE FROM dirs WHERE id=?", dir_ids)
+
+
+def get_index_path(dir_path: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(dir_path).encode(errors="surrogateescape")).hexdigest()
+    return os.path.join(get_cache_dir(), INDEX_DIR_NAME, f"{digest}.sqlite")
+
+
+def find_index_path(dir_path: str) -> str | None:
+    # an index built for any parent dir covers dir_path as well
+    curr_path = os.path.abspath(dir_path)
+    while True:
+        if os.path.exists(index_path := get_index_path(curr_path)):
+            return index_path
+        if (parent_path := os.path.dirname(curr_path)) == curr_path:
+            return None
+        curr_path = parent_path
+
+
+def _get_tree_range(dir_path: str) -> tuple[bytes, bytes, bytes]:
+    # (dir_path, lower bound, upper bound) of the stored paths inside dir_path
+    # NB: paths are stored as bytes and '0' follows '/' -> the range holds exactly the paths inside dir_path
+    dir_key = os.fsencode(dir_path)
+    sep = os.fsencode(os.sep)
+    return dir_key, os.path.join(dir_key, b""), dir_key.rstrip(sep) + bytes([ord(sep) + 1])
+
+
+def get_trigrams(name: str) -> set[str]:
+    # NB: lowercase -> case-insensitive patterns can use the index too
+    name = name.lower()
+    return {name[idx : idx + TRIGRAM_SIZE] for idx in range(len(name) - TRIGRAM_SIZE + 1)}
+
+
+def _get_query_trigrams(name: str, use_regex: bool) -> set[str]:
+    if not use_regex:
+        return get_trigrams(name)
+    trigrams = set()
+    for literal in _get_required_literals(name):
+        trigrams.update(get_trigrams(literal))
+    return trigrams
+
+
+def _get_required_literals(pattern: str) -> list[str]:
+    # runs of plain characters on the top level of the pattern are part of every match
+    # -> classes, groups and repeats only end the current run
+    # NB: dropping a literal only narrows the index less -> anything unclear is dropped instead of parsed
+    if VERBOSE_FLAG_RE.search(pattern):
+        # whitespace and comments are not literal
+        return []
+    literals = []
+    curr_run = []
+    idx = 0
+    while idx < len(pattern):
+        char = pattern[idx]
+        idx += 1
+        if char == "|":
+            # top level alternation -> no character is required
+            return []
+        if char == "\\":
+            escaped = pattern[idx : idx + 1]
+            idx += 1
+            if escaped and not escaped.isalnum() and not escaped.isspace():
+                curr_run.append(escaped)
+                continue
+            # classes (\d), anchors (\b), backreferences (\1) or escape codes (\n, \x41)
+            idx = _skip_escape_argument(pattern, idx, escaped)
+        elif char in "*?{":
+            # the preceding character is optional
+            if curr_run:
+                curr_run.pop()
+            if char == "{" and (idx := pattern.find("}", idx) + 1) == 0:
+                idx = len(pattern)
+        elif char in "([":
+            idx = _skip_group(pattern, idx - 1)
+        elif char not in "+.^$":
+            curr_run.append(char)
+            continue
+        literals.append("".join(curr_run))
+        curr_run = []
+    literals.append("".join(curr_run))
+    return [literal for literal in literals if len(literal) >= TRIGRAM_SIZE]
+
+
+def _skip_escape_argument(pattern: str, idx: int, escaped: str) -> int:
+    # index after the argument of the escape code that ends right before idx
+    # -> e.g. '41' of \x41 is a char code, not text of the name
+    if escaped in ESCAPE_ARGUMENT_LENGTHS:
+        return idx + ESCAPE_ARGUMENT_LENGTHS[escaped]
+    if escaped == "N" and pattern.startswith("{", idx):
+        return pattern.find("}", idx) + 1 or len(pattern)
+    if escaped.isdigit():
+        # NB: group numbers and octal codes (\12, \101) take at most three digits
+        for _ in range(2):
+            if idx < len(pattern) and pattern[idx].isdigit():
+                idx += 1
+    return idx
+
+
+def _skip_group(pattern: str, idx: int) -> int:
+    # index after the group or class opened at idx
+    depth = 0
+    while idx < len(pattern):
+        char = pattern[idx]
+        idx += 1
+        if char == "\\":
+            idx += 1
+        elif char == "[":
+            # NB: a ']' right after the opening bracket (or its negation) is a member of the class
+            idx += pattern.startswith("^", idx)
+            idx += pattern.startswith("]", idx)
+            while idx < len(pattern) and pattern[idx] != "]":
+                idx += 2 if pattern[idx] == "\\" else 1
+            idx += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if depth <= 0:
+            return idx
+    return len(pattern)
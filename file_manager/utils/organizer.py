@@ -1,22 +1,29 @@
-import hashlib
 import os
 import shutil
+import tempfile
+import time
 from collections import defaultdict
-from collections.abc import Generator
-from logging import Logger
+from collections.abc import Callable, Generator, Iterable
+from filecmp import dircmp
+from typing import TypeAlias
 
 import click
 
 from file_manager.logs import log_messages
 from file_manager.logs.logger_factory import get_logger
-from file_manager.utils import should_skip_hidden
+from file_manager.logs.output_sink import OutputSink
+from file_manager.utils import copier, deep_compare, hasher, linker, should_skip_hidden, spill, walker
 from file_manager.utils.config import constants
+from file_manager.utils.hash_cache import HashCache
 
 
 BACKUP_FILE_NAME = ".bak"
+BYTES_PER_MB = 1024 * 1024
 SKIPPED_BACKUP_FILES = [".backup.tar.gz", ".backup.zip"]
 TARGET_MAP = constants.TARGET_MAP
 
+FileRecord: TypeAlias = tuple[str, os.stat_result]
+
 
 def organize_files(
     dir_path: str,
@@ -42,13 +49,12 @@ def organize_files(
 
     exclude_list = exclude.split(",") if exclude else []
     for entry in dir_list:
-        abs_entry_path = os.path.join(abs_dir_path, entry)
-        if os.path.isfile(abs_entry_path):
-            file_extension = _get_file_extension(entry)
-            if (should_skip_hidden(show_hidden, entry)) or file_extension in exclude_list:
-                logger.info(log_messages.SKIP_FILE.format(entry=entry))
+        if walker.is_file(entry):
+            file_extension = _get_file_extension(entry.name)
+            if (should_skip_hidden(show_hidden, entry.name)) or file_extension in exclude_list:
+                logger.info(log_messages.SKIP_FILE.format(entry=entry.name))
                 continue
-            is_reorganized = _handle_entries(abs_dir_path, abs_entry_path, entry, file_extension, logger)
+            is_reorganized = _handle_entries(abs_dir_path, entry.path, entry.name, file_extension, logger)
 
     if not is_reorganized:
         logger.info(log_messages.NOT_REORGANIZED)
@@ -101,50 +107,45 @@ def _handle_files(
     exclude_list: list[str],
     exclude_dir_list: list[str],
     show_hidden: bool,
-    logger: Logger,
+    logger: OutputSink,
     log_file: str,
 ) -> None:
-    abs_dir_path = os.path.join(parent_dir, subdir_path)
-    dir_list = os.listdir(abs_dir_path)
+    dir_stack = [os.path.join(parent_dir, subdir_path)]
+    while dir_stack:
+        abs_dir_path = dir_stack.pop()
+        # NB: list eagerly -> entries are moved around while iterating
+        dir_list = walker.list_entries(abs_dir_path)
+
+        logger.info(log_messages.INSIDE_DIR.format(abs_dir_path=abs_dir_path))
+        nested_dirs = []
+        is_reorganized = False
+        has_skipped = False
+        for entry in dir_list:
+            # handle files
+            if walker.is_file(entry):
+                if entry.name == log_file or entry.name in SKIPPED_BACKUP_FILES:
+                    continue
+                file_extension = _get_file_extension(entry.name)
+                if should_skip_hidden(show_hidden, entry.name) or file_extension in exclude_list:
+                    logger.info(log_messages.SKIP_FILE.format(entry=entry.name))
+                else:
+                    is_reorganized = _handle_entries(
+                        abs_dir_path, entry.path, entry.name, file_extension, logger
+                    )
+            # list nested dirs
+            elif walker.is_dir(entry):
+                # NB: skip hidden dirs -> don't create extra ".hidden" subdirs
+                if _should_skip_dir(entry.name, exclude_dir_list, show_hidden):
+                    logger.info(log_messages.SKIP_DIR.format(entry=entry.name))
+                    has_skipped = True
+                    continue
+                nested_dirs.append(entry.path)
 
-    logger.info(log_messages.INSIDE_DIR.format(abs_dir_path=abs_dir_path))
-    nested_dirs = []
-    is_reorganized = False
-    has_skipped = False
-    for entry in dir_list:
-        abs_entry_path = os.path.join(abs_dir_path, entry)
-        # handle files
-        if os.path.isfile(abs_entry_path):
-            if entry == log_file or entry in SKIPPED_BACKUP_FILES:
-                continue
-            file_extension = _get_file_extension(entry)
-            if should_skip_hidden(show_hidden, entry) or file_extension in exclude_list:
-                logger.info(log_messages.SKIP_FILE.format(entry=entry))
-            else:
-                is_reorganized = _handle_entries(abs_dir_path, abs_entry_path, entry, file_extension, logger)
-        # list nested dirs
-        elif os.path.isdir(abs_entry_path):
-            # NB: skip hidden dirs -> don't create extra ".hidden" subdirs
-            if _should_skip_dir(entry, exclude_dir_list, show_hidden):
-                logger.info(log_messages.SKIP_DIR.format(entry=entry))
-                has_skipped = True
-                continue
-            nested_dirs.append(abs_entry_path)
+        if not (is_reorganized or has_skipped):
+            logger.info(log_messages.NOT_REORGANIZED)
 
-    if not (is_reorganized or has_skipped):
-        logger.info(log_messages.NOT_REORGANIZED)
-
-    # dive recursively to handle nested dirs
-    for nested_dir in nested_dirs:
-        _handle_files(
-            abs_dir_path,
-            nested_dir,
-            exclude_list,
-            exclude_dir_list,
-            show_hidden,
-            logger,
-            log_file,
-        )
+        # push in reverse -> nested dirs are handled in listing order
+        dir_stack.extend(reversed(nested_dirs))
 
 
 def _handle_files_by_flattening_subdirs(
@@ -154,54 +155,52 @@ def _handle_files_by_flattening_subdirs(
     exclude_list: list[str],
     exclude_dir_list: list[str],
     show_hidden: bool,
-    logger: Logger,
+    logger: OutputSink,
     log_file: str,
 ) -> None:
-    abs_dir_path = os.path.join(parent_dir, subdir_path)
-    dir_list = os.listdir(abs_dir_path)
+    # NB: each dir is pushed twice -> handled on first pop, flattened on second pop after all its nested dirs
+    dir_stack = [(os.path.join(parent_dir, subdir_path), False)]
+    while dir_stack:
+        abs_dir_path, is_handled = dir_stack.pop()
+        if is_handled:
+            _flatten_dir(abs_dir_path, root_dir, logger)
+            continue
+
+        dir_list = walker.list_entries(abs_dir_path)
+
+        logger.info(log_messages.INSIDE_DIR.format(abs_dir_path=abs_dir_path))
+        nested_dirs = []
+        is_reorganized = False
+        for entry in dir_list:
+            # handle files
+            if walker.is_file(entry):
+                if entry.name == log_file or entry.name in SKIPPED_BACKUP_FILES:
+                    continue
+                file_extension = _get_file_extension(entry.name)
+                if should_skip_hidden(show_hidden, entry.name) or file_extension in exclude_list:
+                    logger.info(log_messages.MOVE_FILE_TO_ROOT_DIR.format(entry=entry.name))
+                    shutil.move(entry.path, os.path.join(root_dir, entry.name))
+                else:
+                    is_reorganized = _handle_entries(root_dir, entry.path, entry.name, file_extension, logger)
+            # list nested dirs
+            elif walker.is_dir(entry):
+                if _should_skip_dir(entry.name, exclude_dir_list, show_hidden):
+                    logger.info(log_messages.SKIP_DIR_AND_MOVE.format(entry=entry.name))
+                    shutil.move(entry.path, os.path.join(root_dir, entry.name))
+                    continue
+                nested_dirs.append(entry.path)
 
-    logger.info(log_messages.INSIDE_DIR.format(abs_dir_path=abs_dir_path))
-    nested_dirs = []
-    is_reorganized = False
-    for entry in dir_list:
-        abs_entry_path = os.path.join(abs_dir_path, entry)
-        # handle files
-        if os.path.isfile(abs_entry_path):
-            if entry == log_file or entry in SKIPPED_BACKUP_FILES:
-                continue
-            file_extension = _get_file_extension(entry)
-            if should_skip_hidden(show_hidden, entry) or file_extension in exclude_list:
-                logger.info(log_messages.MOVE_FILE_TO_ROOT_DIR.format(entry=entry))
-                shutil.move(abs_entry_path, os.path.join(root_dir, entry))
-            else:
-                is_reorganized = _handle_entries(root_dir, abs_entry_path, entry, file_extension, logger)
-        # list nested dirs
-        elif os.path.isdir(abs_entry_path):
-            if _should_skip_dir(entry, exclude_dir_list, show_hidden):
-                logger.info(log_messages.SKIP_DIR_AND_MOVE.format(entry=entry))
-                shutil.move(abs_entry_path, os.path.join(root_dir, entry))
-                continue
-            nested_dirs.append(abs_entry_path)
+        if not is_reorganized:
+            logger.info(log_messages.NOT_REORGANIZED)
 
-    if not is_reorganized:
-        logger.info(log_messages.NOT_REORGANIZED)
+        dir_stack.append((abs_dir_path, True))
+        dir_stack.extend((nested_dir, False) for nested_dir in reversed(nested_dirs))
 
-    # dive recursively to handle nested dirs
-    for nested_dir in nested_dirs:
-        _handle_files_by_flattening_subdirs(
-            abs_dir_path,
-            nested_dir,
-            root_dir,
-            exclude_list,
-            exclude_dir_list,
-            show_hidden,
-            logger,
-            log_file,
-        )
-    # flatten dir
+
+def _flatten_dir(abs_dir_path: str, root_dir: str, logger: OutputSink) -> None:
     is_not_root_dir = abs_dir_path != root_dir
     is_not_one_level_nested_dir = os.path.join(os.path.dirname(abs_dir_path), "") != root_dir
-    is_not_target_dir = os.path.basename(subdir_path) not in TARGET_MAP.values()
+    is_not_target_dir = os.path.basename(abs_dir_path) not in TARGET_MAP.values()
     if is_not_root_dir and (is_not_one_level_nested_dir or is_not_target_dir):
         logger.info(log_messages.REMOVE_DIR.format(abs_dir_path=abs_dir_path))
         os.rmdir(abs_dir_path)
@@ -262,6 +261,12 @@ def handle_duplicate_files(
     log: str,
     backup: bool,
     archive_format: str,
+    chunk_size: int = hasher.CHUNK_SIZE,
+    jobs: int = 1,
+    use_processes: bool = False,
+    use_cache: bool = True,
+    link_type: str | None = None,
+    hash_algorithm: str = hasher.ALGORITHM,
 ) -> None:
     # BTW: could have used built-in filecmp.cmp but this is more fun
     abs_dir_path, dir_list = _handle_dir_path(dir_path)
@@ -269,8 +274,9 @@ def handle_duplicate_files(
     if backup:
         _create_archive(abs_dir_path, archive_format)
 
-    content_map = _create_duplicate_map(abs_dir_path, dir_list, show_hidden, logger)
-    _handle_duplicates(content_map, abs_dir_path, interactive, logger)
+    with hasher.HashPool(chunk_size, jobs, use_processes, use_cache, hash_algorithm) as hash_pool:
+        content_map = _create_duplicate_map(dir_list, show_hidden, hash_pool, logger)
+    _handle_duplicates(content_map, abs_dir_path, interactive, link_type, logger)
 
 
 def handle_duplicate_files_recursively(
@@ -281,84 +287,358 @@ def handle_duplicate_files_recursively(
     output: str,
     log: str,
     backup: bool,
-    archive_format: str | None = None,
-    logger: Logger | None = None,
+    archive_format: str,
+    chunk_size: int = hasher.CHUNK_SIZE,
+    jobs: int = 1,
+    use_processes: bool = False,
+    use_cache: bool = True,
+    link_type: str | None = None,
+    hash_algorithm: str = hasher.ALGORITHM,
 ) -> None:
-    abs_dir_path, dir_list = _handle_dir_path(dir_path)
-    if not logger:
-        logger = get_logger(output, save, log)
-    logger.info(log_messages.INSIDE_DIR.format(abs_dir_path=abs_dir_path))
+    abs_dir_path = os.path.abspath(dir_path)
+    logger = get_logger(output, save, log)
+    if backup:
+        _create_archive(abs_dir_path, archive_format)
+
+    with hasher.HashPool(chunk_size, jobs, use_processes, use_cache, hash_algorithm) as hash_pool:
+        _handle_duplicate_files_recursively(
+            abs_dir_path, interactive, show_hidden, link_type, hash_pool, logger
+        )
 
+
+def handle_duplicate_files_globally(
+    dir_path: str,
+    interactive: bool,
+    show_hidden: bool,
+    save: bool,
+    output: str,
+    log: str,
+    backup: bool,
+    archive_format: str,
+    chunk_size: int = hasher.CHUNK_SIZE,
+    jobs: int = 1,
+    use_processes: bool = False,
+    use_cache: bool = True,
+    link_type: str | None = None,
+    hash_algorithm: str = hasher.ALGORITHM,
+    memory_limit: int | None = None,
+) -> None:
+    abs_dir_path = os.path.abspath(dir_path)
+    logger = get_logger(output, save, log)
     if backup:
-        _create_archive(abs_dir_path, archive_format)  # noqa
+        _create_archive(abs_dir_path, archive_format)
+
+    with hasher.HashPool(chunk_size, jobs, use_processes, use_cache, hash_algorithm) as hash_pool:
+        if memory_limit:
+            _handle_duplicates_externally(
+                abs_dir_path, interactive, show_hidden, memory_limit, link_type, hash_pool, logger
+            )
+            return
 
-    content_map, subdir_list = _create_duplicate_map_and_subdir_list(
-        abs_dir_path, dir_list, show_hidden, logger
+        # NB: only sizes are indexed for the whole tree -> hashes are computed and kept for size collisions only
+        size_map = _create_size_map(abs_dir_path, show_hidden, logger)
+        digest_map = _hash_size_groups(size_map, hash_pool)
+
+    content_map = defaultdict(list[str])
+    for size_group in size_map.values():
+        for path, _ in size_group:
+            if sha := digest_map.get(path):
+                content_map[sha].append(os.path.relpath(path, abs_dir_path))
+    _handle_duplicates(content_map, abs_dir_path, interactive, link_type, logger)
+
+
+def _create_size_map(abs_dir_path: str, show_hidden: bool, logger: OutputSink) -> dict[int, list[FileRecord]]:
+    size_map = defaultdict(list[FileRecord])
+    for entry in _iter_tree_files(abs_dir_path, show_hidden, logger):
+        stat = entry.stat()
+        size_map[stat.st_size].append((entry.path, stat))
+    # drop unique sizes right away -> they can't have duplicates
+    return {size: size_group for size, size_group in size_map.items() if len(size_group) > 1}
+
+
+def _iter_tree_files(abs_dir_path: str, show_hidden: bool, logger: OutputSink) -> Generator[os.DirEntry]:
+    # inodes of files with several hard links -> every other link to them is the same file
+    seen_inodes = set()
+    dir_stack = [abs_dir_path]
+    while dir_stack:
+        subdir_list = []
+        for entry in walker.list_entries(dir_stack.pop()):
+            if walker.is_file(entry):
+                if should_skip_hidden(show_hidden, entry.name) or entry.is_symlink():
+                    logger.info(
+                        log_messages.SKIP_FILE.format(entry=os.path.relpath(entry.path, abs_dir_path))
+                    )
+                    continue
+                stat = entry.stat()
+                if stat.st_nlink > 1:
+                    if (stat.st_dev, stat.st_ino) in seen_inodes:
+                        continue
+                    seen_inodes.add((stat.st_dev, stat.st_ino))
+                yield entry
+            elif walker.is_dir(entry):
+                subdir_list.append(entry.path)
+        dir_stack.extend(reversed(subdir_list))
+
+
+def _handle_duplicates_externally(
+    abs_dir_path: str,
+    interactive: bool,
+    show_hidden: bool,
+    memory_limit: int,
+    link_type: str | None,
+    hash_pool: hasher.HashPool,
+    logger: OutputSink,
+) -> None:
+    # NB: the stages of _hash_size_groups run over sorted run files on disk instead of in-memory maps
+    # -> records are (size, [digest,] path_id) and path strings stay in an on-disk table
+    max_records = memory_limit // spill.RECORD_SIZE
+    with tempfile.TemporaryDirectory(prefix="fm-dedup-") as temp_dir, spill.PathTable(temp_dir) as path_table:
+        # stage 1: sizes
+        size_runs = spill.SortedRuns(temp_dir, max_records)
+        for entry in _iter_tree_files(abs_dir_path, show_hidden, logger):
+            size_runs.add((entry.stat().st_size, path_table.add(entry.path)))
+
+        # stage 2: samples of size collisions
+        # NB: every record keeps the id of the first file walked with its size
+        # -> groups are reported in the order of the in-memory size map
+        size_groups = (
+            [(size, group[0][-1], path_id) for size, path_id in group]
+            for group in spill.group_sorted(size_runs, 1)
+        )
+        sample_runs = spill.SortedRuns(temp_dir, max_records)
+        for record in _hash_record_groups(
+            size_groups,
+            hash_pool.hash_samples,
+            max_records,
+            path_table,
+            sample_stage=True,
+        ):
+            sample_runs.add(record)
+
+        # stage 3: full content of sample collisions
+        digest_runs = spill.SortedRuns(temp_dir, max_records)
+        for record in _hash_record_groups(
+            spill.group_sorted(sample_runs, 2), hash_pool.hash_files, max_records, path_table
+        ):
+            digest_runs.add(record)
+
+        duplicate_groups = _iter_duplicate_groups(
+            spill.group_sorted(digest_runs, 2), abs_dir_path, hash_pool.needs_verify, path_table
+        )
+        _handle_duplicate_groups(
+            duplicate_groups, abs_dir_path, temp_dir, max_records, interactive, link_type, logger
+        )
+
+
+def _hash_record_groups(
+    record_groups: Iterable[list[tuple]],
+    hash_func: Callable[[list[str], list[os.stat_result]], list[str]],
+    max_records: int,
+    path_table: spill.PathTable,
+    sample_stage: bool = False,
+) -> Generator[tuple[int, str, int, int]]:
+    # hash whole groups in batches of up to max_records -> the workers get enough files at once
+    batch = []
+    for group in record_groups:
+        batch.extend(group)
+        if len(batch) >= max_records:
+            yield from _hash_record_batch(batch, hash_func, path_table, sample_stage)
+            batch = []
+    yield from _hash_record_batch(batch, hash_func, path_table, sample_stage)
+
+
+def _hash_record_batch(
+    batch: list[tuple],
+    hash_func: Callable[[list[str], list[os.stat_result]], list[str]],
+    path_table: spill.PathTable,
+    sample_stage: bool,
+) -> Generator[tuple[int, str, int, int]]:
+    # small files are read whole by the sample anyway -> they skip the sample stage with an empty digest
+    hashed = [record for record in batch if not sample_stage or hasher.is_sampled(record[0])]
+    paths = [path_table.get(record[-1]) for record in hashed]
+    digest_map = dict(
+        zip((record[-1] for record in hashed), hash_func(paths, [os.stat(path) for path in paths]))
     )
-    # handle duplicates in current dir
-    _handle_duplicates(content_map, abs_dir_path, interactive, logger)
-    # dive recursively into nested subdirs
-    logger.info(log_messages.DUPLICATE_DELIMITER)
-    for subdir in subdir_list:
-        handle_duplicate_files_recursively(
-            subdir,
-            interactive,
-            show_hidden,
-            save,
-            output,
-            log,
-            backup=False,
-            archive_format=None,
-            logger=logger,
+    for record in batch:
+        yield record[0], digest_map.get(record[-1], ""), *record[-2:]
+
+
+def _iter_duplicate_groups(
+    record_groups: Iterable[list[tuple]], abs_dir_path: str, needs_verify: bool, path_table: spill.PathTable
+) -> Generator[tuple[int, int, list[str]]]:
+    # (id of the first file walked with the size, id of the first file walked in the group, group)
+    # NB: path ids grow with the walk -> same order as the in-memory content map
+    for group in record_groups:
+        path_ids = {path_table.get(path_id): path_id for *_, path_id in group}
+        paths = list(path_ids)
+        for file_list in hasher.split_by_content(paths) if needs_verify else [paths]:
+            first_id = min(path_ids[path] for path in file_list)
+            content_map = {0: [os.path.relpath(path, abs_dir_path) for path in file_list]}
+            for duplicate_group in _transform_content_map(content_map):
+                yield group[0][2], first_id, duplicate_group
+
+
+def _handle_duplicate_groups(
+    duplicate_groups: Iterable[tuple[int, int, list[str]]],
+    abs_dir_path: str,
+    temp_dir: str,
+    max_records: int,
+    interactive: bool,
+    link_type: str | None,
+    logger: OutputSink,
+) -> None:
+    # groups are found by size and digest -> sort them back into walk order before reporting
+    group_runs = spill.SortedRuns(temp_dir, max_records)
+    for record in duplicate_groups:
+        group_runs.add(record)
+
+    # report groups in order and park them on disk until the report is complete
+    has_duplicates = False
+    with open(os.path.join(temp_dir, "duplicates"), "w+b") as f:
+        for *_, group in group_runs:
+            if not has_duplicates:
+                logger.info(
+                    log_messages.LISTED_DUPLICATE_FILES.format(dir_path=abs_dir_path, display_list="")
+                )
+                has_duplicates = True
+            logger.info("".join(_prepare_display_list([group])))
+            spill.dump_records([group], f)
+
+        if not has_duplicates:
+            logger.info(log_messages.NO_DUPLICATE_FILES.format(dir_path=abs_dir_path))
+            return
+        f.seek(0)
+        for group in spill.load_records(f):
+            _merge_duplicates(abs_dir_path, [group], interactive, link_type, logger)
+
+
+def _handle_duplicate_files_recursively(
+    abs_dir_path: str,
+    interactive: bool,
+    show_hidden: bool,
+    link_type: str | None,
+    hash_pool: hasher.HashPool,
+    logger: OutputSink,
+) -> None:
+    dir_stack = [abs_dir_path]
+    while dir_stack:
+        abs_dir_path, dir_list = _handle_dir_path(dir_stack.pop())
+        logger.info(log_messages.INSIDE_DIR.format(abs_dir_path=abs_dir_path))
+
+        content_map, subdir_list = _create_duplicate_map_and_subdir_list(
+            dir_list, show_hidden, hash_pool, logger
         )
+        # handle duplicates in current dir
+        _handle_duplicates(content_map, abs_dir_path, interactive, link_type, logger)
+        logger.info(log_messages.DUPLICATE_DELIMITER)
+        # push in reverse -> nested subdirs are handled in listing order
+        dir_stack.extend(reversed(subdir_list))
 
 
 def _create_duplicate_map(
-    abs_dir_path: str, dir_list: list[str], show_hidden: bool, logger: Logger
+    dir_list: list[os.DirEntry], show_hidden: bool, hash_pool: hasher.HashPool, logger: OutputSink
 ) -> defaultdict[str, list[str]]:
-    content_map = defaultdict(list[str])
+    file_list = []
     for entry in dir_list:
-        abs_entry_path = os.path.join(abs_dir_path, entry)
-        if os.path.isfile(abs_entry_path):
-            _add_entry(entry, abs_entry_path, content_map, show_hidden, logger)
-    return content_map
+        if walker.is_file(entry):
+            _add_entry(entry, file_list, show_hidden, logger)
+    return _create_content_map(file_list, hash_pool)
 
 
 def _create_duplicate_map_and_subdir_list(
-    abs_dir_path: str, dir_list: list[str], show_hidden: bool, logger: Logger
+    dir_list: list[os.DirEntry], show_hidden: bool, hash_pool: hasher.HashPool, logger: OutputSink
 ) -> tuple[defaultdict[str, list[str]], list[str]]:
-    content_map = defaultdict(list[str])
+    file_list = []
     subdir_list = []
     for entry in dir_list:
-        abs_entry_path = os.path.join(abs_dir_path, entry)
-        if os.path.isfile(abs_entry_path):
-            _add_entry(entry, abs_entry_path, content_map, show_hidden, logger)
-        elif os.path.isdir(abs_entry_path):
-            subdir_list.append(abs_entry_path)
-    return content_map, subdir_list
+        if walker.is_file(entry):
+            _add_entry(entry, file_list, show_hidden, logger)
+        elif walker.is_dir(entry):
+            subdir_list.append(entry.path)
+    return _create_content_map(file_list, hash_pool), subdir_list
 
 
 def _add_entry(
-    entry: str,
-    abs_entry_path: str,
-    content_map: defaultdict[str, list[str]],
+    entry: os.DirEntry,
+    file_list: list[os.DirEntry],
     show_hidden: bool,
-    logger: Logger,
+    logger: OutputSink,
 ) -> None:
-    if should_skip_hidden(show_hidden, entry):
-        logger.info(log_messages.SKIP_FILE.format(entry=entry))
+    # NB: a symlink matches the content of its target -> keeping it could delete the only real copy
+    if should_skip_hidden(show_hidden, entry.name) or entry.is_symlink():
+        logger.info(log_messages.SKIP_FILE.format(entry=entry.name))
         return
+    file_list.append(entry)
+
+
+def _create_content_map(
+    file_list: list[os.DirEntry], hash_pool: hasher.HashPool
+) -> defaultdict[str, list[str]]:
+    # stage 1: only files of equal size could be duplicates
+    size_map = defaultdict(list[FileRecord])
+    for entry in file_list:
+        stat = entry.stat()
+        size_map[stat.st_size].append((entry.path, stat))
+    digest_map = _hash_size_groups(size_map, hash_pool)
+
+    # NB: fill map in listing order -> duplicate groups are reported as if every file was hashed serially
+    content_map = defaultdict(list[str])
+    for entry in file_list:
+        if sha := digest_map.get(entry.path):
+            content_map[sha].append(entry.name)
+    return content_map
+
+
+def _hash_size_groups(size_map: dict[int, list[FileRecord]], hash_pool: hasher.HashPool) -> dict[str, str]:
+    # stage 2: hash head and tail of large files
+    # -> small files and sample collisions are hashed fully (in one batch to keep the workers busy)
+    full_hash_list = []
+    sample_list = []
+    for size, size_group in size_map.items():
+        if len(size_group) < 2:
+            continue
+        if hasher.is_sampled(size):
+            sample_list.extend(size_group)
+        else:
+            full_hash_list.extend(size_group)
+
+    sample_map = defaultdict(list[FileRecord])
+    sample_digests = hash_pool.hash_samples(
+        [path for path, _ in sample_list], [stat for _, stat in sample_list]
+    )
+    for record, sample in zip(sample_list, sample_digests):
+        sample_map[(record[1].st_size, sample)].append(record)
+    for sample_group in sample_map.values():
+        if len(sample_group) > 1:
+            full_hash_list.extend(sample_group)
+
+    # stage 3: hash full content
+    paths = [path for path, _ in full_hash_list]
+    digest_map = dict(zip(paths, hash_pool.hash_files(paths, [stat for _, stat in full_hash_list])))
+    if hash_pool.needs_verify:
+        digest_map = _verify_digests(digest_map)
+    return digest_map
+
+
+def _verify_digests(digest_map: dict[str, str]) -> dict[str, str]:
+    collision_map = defaultdict(list[str])
+    for path, digest in digest_map.items():
+        collision_map[digest].append(path)
 
-    with open(abs_entry_path, "rb") as f:
-        sha = hashlib.sha1(f.read()).hexdigest()
-    content_map[sha].append(entry)
+    # NB: assign a distinct digest to every group of files with really identical content
+    verified_map = {}
+    for digest, paths in collision_map.items():
+        for idx, group in enumerate(hasher.split_by_content(paths) if len(paths) > 1 else [paths]):
+            verified_map.update((path, f"{digest}-{idx}") for path in group)
+    return verified_map
 
 
 def _handle_duplicates(
     content_map: defaultdict[str, list[str]],
     dir_path: str,
     interactive: bool,
-    logger: Logger,
+    link_type: str | None,
+    logger: OutputSink,
 ) -> None:
     duplicate_list = _transform_content_map(content_map)
     # display sorted map entries
@@ -372,7 +652,7 @@ def _handle_duplicates(
         )
     )
     # clean-up files
-    _merge_duplicates(dir_path, duplicate_list, interactive, logger)
+    _merge_duplicates(dir_path, duplicate_list, interactive, link_type, logger)
 
 
 def _transform_content_map(content_map: defaultdict[str, list[str]]) -> list[list[str]]:
@@ -395,30 +675,313 @@ def _merge_duplicates(
     abs_dir_path: str,
     duplicate_list: list[list[str]],
     interactive: bool,
-    logger: Logger,
+    link_type: str | None,
+    logger: OutputSink,
 ) -> None:
     for entry in duplicate_list:
         for idx, file in enumerate(entry):
             abs_file_path = os.path.join(abs_dir_path, file)
             if idx == 0:
                 if interactive:
+                    # NB: show the buffered duplicate list before waiting for input
+                    logger.flush()
                     target_name = click.prompt(
                         text=log_messages.PRE_MERGE_PROMPT.format(entry=entry),
                         type=click.STRING,
                     )
+                    # NB: in global mode duplicates are spread over subdirs -> keep target next to the first one
+                    abs_target_path = os.path.join(os.path.dirname(abs_file_path), target_name)
                 else:
                     target_name = file
-                abs_target_path = os.path.join(abs_dir_path, target_name)
-                logger.info(log_messages.MERGE_FILES.format(entry=entry, target_name=target_name))
+                    abs_target_path = abs_file_path
+                merge_msg = log_messages.LINK_FILES if link_type else log_messages.MERGE_FILES
+                logger.info(merge_msg.format(entry=entry, target_name=target_name, link_type=link_type))
                 shutil.move(abs_file_path, abs_target_path)
-            else:
+            elif link_type:
+                _link_duplicate(abs_target_path, abs_file_path, file, link_type, logger)
+            elif linker.is_same_content(abs_target_path, abs_file_path):
+                # NB: digests may come from the cache -> never delete without comparing the bytes
                 os.remove(abs_file_path)
+            else:
+                logger.info(log_messages.LINK_CONTENT_DIFFERS.format(entry=file))
+
+
+def _link_duplicate(
+    abs_target_path: str, abs_file_path: str, file: str, link_type: str, logger: OutputSink
+) -> None:
+    if link_type == linker.HARD_LINK and os.path.samefile(abs_target_path, abs_file_path):
+        return
+    # NB: files were matched by hash -> compare them byte by byte before dropping any content
+    if not linker.is_same_content(abs_target_path, abs_file_path):
+        logger.info(log_messages.LINK_CONTENT_DIFFERS.format(entry=file))
+        return
+    try:
+        linker.link_duplicate(abs_target_path, abs_file_path, link_type)
+    except linker.LinkNotSupportedError as e:
+        logger.info(log_messages.LINK_NOT_SUPPORTED.format(entry=file, link_type=link_type, error=e.strerror))
+
+
+#####################################
+def benchmark_hash_algorithms(
+    dir_path: str, sample_size: int, chunk_size: int, save: bool, output: str, log: str
+) -> None:
+    abs_dir_path = os.path.abspath(dir_path)
+    logger = get_logger(output, save, log)
+
+    paths, total_size = _pick_sample_files(abs_dir_path, sample_size * BYTES_PER_MB)
+    if not paths:
+        logger.info(log_messages.NO_FILES.format(dir_path=abs_dir_path))
+        return
+    logger.info(
+        log_messages.BENCH_SAMPLE.format(
+            count=len(paths), size=total_size / BYTES_PER_MB, dir_path=abs_dir_path
+        )
+    )
+    logger.flush()
+    # NB: read the sample once up front -> every algorithm is measured on equally warm page cache
+    for path in paths:
+        hasher.hash_file(path, chunk_size, "crc32+verify")
+
+    for algorithm in hasher.HASH_MAP:
+        start = time.perf_counter()
+        for path in paths:
+            hasher.hash_file(path, chunk_size, algorithm)
+            if algorithm in hasher.VERIFIED_ALGORITHMS:
+                # NB: equal checksums are confirmed byte by byte -> measure the case of every file colliding
+                hasher.split_by_content([path, path])
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        logger.info(
+            log_messages.BENCH_RESULT.format(
+                algorithm=algorithm, throughput=total_size / BYTES_PER_MB / elapsed
+            )
+        )
+        # report each result as soon as it's measured
+        logger.flush()
+    logger.info(log_messages.BENCH_VERIFY_NOTE)
+
+
+def _pick_sample_files(abs_dir_path: str, max_size: int) -> tuple[list[str], int]:
+    paths = []
+    total_size = 0
+    dir_stack = [abs_dir_path]
+    while dir_stack and total_size < max_size:
+        subdir_list = []
+        for entry in walker.list_entries(dir_stack.pop()):
+            if walker.is_file(entry) and (size := entry.stat().st_size):
+                paths.append(entry.path)
+                total_size += size
+                if total_size >= max_size:
+                    break
+            elif walker.is_dir(entry):
+                subdir_list.append(entry.path)
+        dir_stack.extend(reversed(subdir_list))
+    return paths, total_size
+
+
+#####################################
+def prune_hash_cache(max_age: int | None, clear: bool, save: bool, output: str, log: str) -> None:
+    logger = get_logger(output, save, log)
+    with HashCache() as cache:
+        removed = cache.clear() if clear else cache.prune(max_age)
+        cache.vacuum()
+        logger.info(
+            log_messages.CACHE_PRUNED.format(count=removed, path=cache.cache_path, remaining=cache.count())
+        )
+
+
+#####################################
+def sync_directories(
+    dir_path: str,
+    other_path: str,
+    ignore: str,
+    delete: bool,
+    dry_run: bool,
+    deep: bool,
+    jobs: int,
+    show_hidden: bool,
+    save: bool,
+    output: str,
+    log: str,
+) -> None:
+    logger = get_logger(output, save, log)
+    abs_source = os.path.abspath(dir_path)
+    abs_target = os.path.abspath(other_path)
+    if abs_source == abs_target:
+        logger.info(log_messages.IDENTICAL_PATHS)
+        return
+
+    ignore_list = ignore.split(",") if ignore else []
+    prefix = log_messages.DRY_RUN if dry_run else ""
+    copied = removed = 0
+    with copier.CopyPool(jobs) as copy_pool:
+        if not os.path.isdir(abs_target):
+            copied = _copy_tree(abs_source, abs_target, ignore_list, show_hidden, dry_run, copy_pool, logger)
+        else:
+            for cmp_obj in _iter_sync_tree(abs_source, abs_target, ignore_list, show_hidden, deep, jobs):
+                dir_copied, dir_removed = _sync_dir(
+                    cmp_obj, ignore_list, show_hidden, delete, dry_run, copy_pool, logger
+                )
+                copied += dir_copied
+                removed += dir_removed
+    logger.info(
+        prefix
+        + log_messages.SYNC_DONE.format(source=abs_source, target=abs_target, copied=copied, removed=removed)
+    )
+
+
+def _iter_sync_tree(
+    abs_source: str, abs_target: str, ignore_list: list[str], show_hidden: bool, deep: bool, jobs: int
+) -> Generator[dircmp | deep_compare.DeepDirCmp]:
+    if deep:
+        yield from deep_compare.walk_deep_diff(abs_source, abs_target, ignore_list, show_hidden, True, jobs)
+        return
+    cmp_stack = [dircmp(abs_source, abs_target, ignore=ignore_list)]
+    while cmp_stack:
+        cmp_obj = cmp_stack.pop()
+        yield cmp_obj
+        cmp_stack.extend(
+            sub_dir
+            for name, sub_dir in reversed(cmp_obj.subdirs.items())
+            if not should_skip_hidden(show_hidden, name)
+        )
+
+
+def _sync_dir(
+    cmp_obj: dircmp | deep_compare.DeepDirCmp,
+    ignore_list: list[str],
+    show_hidden: bool,
+    delete: bool,
+    dry_run: bool,
+    copy_pool: copier.CopyPool,
+    logger: OutputSink,
+) -> tuple[int, int]:
+    prefix = log_messages.DRY_RUN if dry_run else ""
+    copied = 0
+    for name in cmp_obj.left_only:
+        if not should_skip_hidden(show_hidden, name):
+            copied += _copy_entry(
+                os.path.join(cmp_obj.left, name),
+                os.path.join(cmp_obj.right, name),
+                ignore_list,
+                show_hidden,
+                dry_run,
+                copy_pool,
+                logger,
+            )
+
+    # NB: dircmp compares by stat signature first -> files copied with their mtime are skipped next time
+    for name in cmp_obj.diff_files:
+        if not should_skip_hidden(show_hidden, name):
+            _copy_file(
+                os.path.join(cmp_obj.left, name),
+                os.path.join(cmp_obj.right, name),
+                dry_run,
+                copy_pool,
+                logger,
+            )
+            copied += 1
+    for name in cmp_obj.funny_files:
+        if not should_skip_hidden(show_hidden, name):
+            logger.info(prefix + log_messages.SKIP_FILE.format(entry=os.path.join(cmp_obj.left, name)))
+
+    removed = 0
+    # e.g. a file on one side and a dir on the other -> the target entry is replaced by the source one
+    for name in cmp_obj.common_funny:
+        if should_skip_hidden(show_hidden, name):
+            continue
+        source = os.path.join(cmp_obj.left, name)
+        # NB: same rules as _copy_entry -> the target is only removed if the source gets copied
+        if not os.path.isfile(source) and not (os.path.isdir(source) and not os.path.islink(source)):
+            logger.info(prefix + log_messages.SKIP_FILE.format(entry=source))
+            continue
+        target = os.path.join(cmp_obj.right, name)
+        _remove_entry(target, dry_run, logger)
+        removed += 1
+        copied += _copy_entry(source, target, ignore_list, show_hidden, dry_run, copy_pool, logger)
+
+    if delete:
+        for name in cmp_obj.right_only:
+            if not should_skip_hidden(show_hidden, name):
+                _remove_entry(os.path.join(cmp_obj.right, name), dry_run, logger)
+                removed += 1
+    return copied, removed
+
+
+def _copy_entry(
+    source: str,
+    target: str,
+    ignore_list: list[str],
+    show_hidden: bool,
+    dry_run: bool,
+    copy_pool: copier.CopyPool,
+    logger: OutputSink,
+) -> int:
+    if os.path.isdir(source) and not os.path.islink(source):
+        return _copy_tree(source, target, ignore_list, show_hidden, dry_run, copy_pool, logger)
+    if os.path.isfile(source):
+        _copy_file(source, target, dry_run, copy_pool, logger)
+        return 1
+    logger.info((log_messages.DRY_RUN if dry_run else "") + log_messages.SKIP_FILE.format(entry=source))
+    return 0
+
+
+def _remove_entry(target: str, dry_run: bool, logger: OutputSink) -> None:
+    logger.info((log_messages.DRY_RUN if dry_run else "") + log_messages.REMOVE_ENTRY.format(entry=target))
+    if dry_run:
+        return
+    if os.path.isdir(target) and not os.path.islink(target):
+        shutil.rmtree(target)
+    else:
+        os.remove(target)
+
+
+def _copy_tree(
+    source_dir: str,
+    target_dir: str,
+    ignore_list: list[str],
+    show_hidden: bool,
+    dry_run: bool,
+    copy_pool: copier.CopyPool,
+    logger: OutputSink,
+) -> int:
+    prefix = log_messages.DRY_RUN if dry_run else ""
+    copied = 0
+    dir_stack = [(source_dir, target_dir)]
+    while dir_stack:
+        source_dir, target_dir = dir_stack.pop()
+        logger.info(prefix + log_messages.CREATE_DIR.format(target_dir=target_dir))
+        if not dry_run:
+            os.makedirs(target_dir, exist_ok=True)
+        subdirs = []
+        for entry in sorted(walker.iter_entries(source_dir), key=lambda entry: entry.name):
+            if entry.name in ignore_list or should_skip_hidden(show_hidden, entry.name):
+                continue
+            target = os.path.join(target_dir, entry.name)
+            # symlinked dirs are not followed -> no loops
+            if walker.is_dir(entry) and not entry.is_symlink():
+                subdirs.append((entry.path, target))
+            elif walker.is_file(entry):
+                _copy_file(entry.path, target, dry_run, copy_pool, logger)
+                copied += 1
+            else:
+                logger.info(prefix + log_messages.SKIP_FILE.format(entry=entry.path))
+        dir_stack.extend(reversed(subdirs))
+    return copied
+
+
+def _copy_file(
+    source: str, target: str, dry_run: bool, copy_pool: copier.CopyPool, logger: OutputSink
+) -> None:
+    prefix = log_messages.DRY_RUN if dry_run else ""
+    logger.info(prefix + log_messages.COPY_FILE.format(source=source, target=target))
+    if not dry_run:
+        copy_pool.copy(source, target)
 
 
 # ### helpers ###
-def _handle_dir_path(dir_path: str) -> tuple[str, list[str]]:
+def _handle_dir_path(dir_path: str) -> tuple[str, list[os.DirEntry]]:
     abs_dir_path = os.path.abspath(dir_path)
-    dir_list = os.listdir(dir_path)
+    dir_list = walker.list_entries(abs_dir_path)
     return abs_dir_path, dir_list
 
 
@@ -437,7 +1000,7 @@ def _handle_entries(
     abs_entry_path: str,
     entry: str,
     file_extension: str,
-    logger: Logger,
+    logger: OutputSink,
 ) -> bool:
     if entry.startswith("."):
         target_dir_name = TARGET_MAP["hidden"]
@@ -0,0 +1,66 @@
+import os
+from typing import Callable
+
+from file_manager.utils import walker
+from file_manager.utils.matcher import NameMatcher
+
+FILE_TYPE = "f"
+DIR_TYPE = "d"
+ENTRY_TYPES = (FILE_TYPE, DIR_TYPE)
+
+
+class EntryFilter:
+    def __init__(
+        self,
+        name_matcher: NameMatcher | None = None,
+        extensions: list[str] | None = None,
+        entry_type: str | None = None,
+        min_size: int | None = None,
+        max_size: int | None = None,
+        newer: float | None = None,
+        older: float | None = None,
+    ) -> None:
+        self.entry_type = entry_type
+        # NB: predicates are ordered by cost -> names first, then the cached d_type and only then stat
+        self._name_predicates: list[Callable[[str], bool]] = []
+        if name_matcher:
+            self._name_predicates.append(name_matcher.search)
+        if extensions:
+            suffixes = tuple(f".{ext.strip().lstrip('.').lower()}" for ext in extensions)
+            self._name_predicates.append(lambda name: name.lower().endswith(suffixes))
+
+        self._stat_predicates: list[Callable[[os.stat_result], bool]] = []
+        if min_size is not None:
+            self._stat_predicates.append(lambda stat: stat.st_size >= min_size)
+        if max_size is not None:
+            self._stat_predicates.append(lambda stat: stat.st_size <= max_size)
+        if newer is not None:
+            self._stat_predicates.append(lambda stat: stat.st_mtime > newer)
+        if older is not None:
+            self._stat_predicates.append(lambda stat: stat.st_mtime < older)
+
+    def __call__(self, entry: os.DirEntry) -> bool | None:
+        # True -> matching file, False -> matching dir, None -> no match
+        if not all(predicate(entry.name) for predicate in self._name_predicates):
+            return None
+
+        if walker.is_file(entry):
+            if self.entry_type == DIR_TYPE:
+                return None
+            is_file = True
+        elif walker.is_dir(entry):
+            if self.entry_type == FILE_TYPE:
+                return None
+            is_file = False
+        else:
+            return None
+
+        if self._stat_predicates:
+            try:
+                # DirEntry caches the result -> sorting or writing records later costs no extra syscall
+                stat = entry.stat()
+            except OSError:
+                return None
+            if not all(predicate(stat) for predicate in self._stat_predicates):
+                return None
+        return is_file
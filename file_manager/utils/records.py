@@ -0,0 +1,59 @@
+import csv
+import json
+import os
+import stat
+
+from file_manager.logs.output_sink import OutputSink
+
+TEXT = "text"
+NDJSON = "ndjson"
+CSV = "csv"
+OUTPUT_FORMATS = (TEXT, NDJSON, CSV)
+FIELDS = ("path", "type", "size", "mtime", "status")
+
+FILE_TYPE = "file"
+DIR_TYPE = "dir"
+OTHER_TYPE = "other"
+
+
+class RecordWriter:
+    def __init__(self, sink: OutputSink, output_format: str) -> None:
+        self._sink = sink
+        if output_format == CSV:
+            csv_writer = csv.writer(sink, lineterminator="\n")
+            csv_writer.writerow(FIELDS)
+            self._write_row = csv_writer.writerow
+        else:
+            self._write_row = self._write_json
+
+    def write_entry(self, entry: os.DirEntry, status: str | None = None) -> None:
+        # NB: DirEntry caches its stat -> entries already stat-ed for sorting cost nothing extra
+        try:
+            stat_result = entry.stat()
+        except OSError:
+            stat_result = None
+        self._write(entry.path, stat_result, status)
+
+    def write_path(self, path: str, status: str | None = None) -> None:
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            stat_result = None
+        self._write(path, stat_result, status)
+
+    def _write(self, path: str, stat_result: os.stat_result | None, status: str | None) -> None:
+        if stat_result is None:
+            self._write_row((os.path.abspath(path), OTHER_TYPE, None, None, status))
+            return
+        if stat.S_ISDIR(stat_result.st_mode):
+            entry_type = DIR_TYPE
+        elif stat.S_ISREG(stat_result.st_mode):
+            entry_type = FILE_TYPE
+        else:
+            entry_type = OTHER_TYPE
+        self._write_row(
+            (os.path.abspath(path), entry_type, stat_result.st_size, stat_result.st_mtime, status)
+        )
+
+    def _write_json(self, row: tuple) -> None:
+        self._sink.info(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + "\n")
@@ -1,13 +1,33 @@
+import heapq
 import os
-import re
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from filecmp import dircmp
-from logging import Logger
-from typing import Callable
+from functools import partial
+from itertools import chain, groupby, islice
+from operator import itemgetter
+from typing import Callable, TypeAlias
 
 from file_manager.logs import log_messages
 from file_manager.logs.logger_factory import get_logger
-from file_manager.utils import should_skip_hidden
+from file_manager.logs.output_sink import OutputSink
+from file_manager.utils import (
+    content,
+    deep_compare,
+    hasher,
+    manifest,
+    move_detector,
+    name_index,
+    records,
+    should_skip_hidden,
+    walker,
+)
+from file_manager.utils.matcher import NameMatcher
+from file_manager.utils.predicates import EntryFilter
+
+SortKey: TypeAlias = Callable[[os.DirEntry], tuple]
+# tells which section of a split listing an entry goes to: True -> first, False -> second, None -> skipped
+Classifier: TypeAlias = Callable[[os.DirEntry], bool | None]
+DirComparison: TypeAlias = dircmp | deep_compare.DeepDirCmp | manifest.ManifestDirCmp
 
 FOLDER_EMOJI = "\U0001f4c1"
 FILE_EMOJI = "\U0001f4c3"
@@ -21,15 +41,29 @@ STATS_MAP = {
     "common_funny": log_messages.COMMON_TROUBLE,
 }
 DIR_SHOW_MAP = {
-    "os_func_name": "isdir",
+    "entry_func_name": "is_dir",
+    "header_msg": "NESTED_SUBDIRS_HEADER",
     "not_found_msg": "NO_SUBDIRS",
     "success_msg": "NESTED_SUBDIRS",
 }
 FILE_SHOW_MAP = {
-    "os_func_name": "isfile",
+    "entry_func_name": "is_file",
+    "header_msg": "LISTED_FILES_HEADER",
     "not_found_msg": "NO_FILES",
     "success_msg": "LISTED_FILES",
 }
+SORT_KEY_MAP = {
+    "name": lambda entry, _: entry.name,
+    "size": lambda _, stat: stat.st_size,
+    "date": lambda _, stat: stat.st_ctime,
+    "modified": lambda _, stat: stat.st_mtime,
+    "type": lambda entry, _: os.path.splitext(entry.name)[1],
+}
+STAT_SORT_KEYS = {"size", "date", "modified"}
+# number of entries joined into a single message while streaming unsorted listings
+STREAM_CHUNK_SIZE = 1024
+# NB: hits of search and find may be far apart in a huge dir -> each one is passed on as soon as it's found
+FILTERED_CHUNK_SIZE = 1
 
 
 def show(
@@ -37,6 +71,8 @@ def show(
     show_hidden: bool,
     sort: str,
     desc: bool,
+    limit: int | None,
+    unsorted: bool,
     list_dirs: bool,
     save: bool,
     output: str,
@@ -45,13 +81,19 @@ def show(
     show_map = DIR_SHOW_MAP if list_dirs else FILE_SHOW_MAP
     logger = get_logger(output, save, log)
 
-    dir_list = os.listdir(dir_path)
-    if entries := _build_entries_list(dir_path, dir_list, show_map["os_func_name"], show_hidden):
-        _sort_entries_list(dir_path, entries, sort, desc)
+    if unsorted:
+        for log_msg in _stream_entries_list(dir_path, show_map, show_hidden, limit):
+            logger.info(log_msg)
+        return
+
+    sort_key = _get_sort_key(sort)
+    if entries := _build_entries_list(
+        dir_path, show_map["entry_func_name"], show_hidden, sort_key, desc, limit
+    ):
         logger.info(
             getattr(log_messages, show_map["success_msg"]).format(
                 dir_path=os.path.abspath(dir_path),
-                entries_list=_format_entries(entries),
+                entries_list=_format_entries(_order_entries(entries, sort_key, desc, limit)),
             )
         )
     else:
@@ -61,101 +103,269 @@ def show(
 
 
 def _build_entries_list(
-    dir_path: str, dir_list: list[str], os_func_name: str, show_hidden: bool
-) -> list[str]:
-    os_func = getattr(os.path, os_func_name)
+    dir_path: str,
+    entry_func_name: str,
+    show_hidden: bool,
+    sort_key: SortKey,
+    desc: bool,
+    limit: int | None,
+) -> list[os.DirEntry]:
+    entry_func = getattr(walker, entry_func_name)
     entries_list = []
-    for entry in dir_list:
-        if not os_func(os.path.join(dir_path, entry)) or should_skip_hidden(show_hidden, entry):
+    for entry in walker.iter_entries(dir_path):
+        # NB: check name first -> hidden entries are dropped without touching the file system
+        if should_skip_hidden(show_hidden, entry.name) or not entry_func(entry):
             continue
-        entries_list.append(entry)
+        _add_to_selection(entries_list, entry, sort_key, desc, limit)
     return entries_list
 
 
-def _sort_entries_list(dir_path: str, entries_list: list[str], criteria: str, desc: bool) -> None:
-    match criteria:
-        case "name":
-            sort_func = None
-        case "size":
-            sort_func = lambda file: os.path.getsize(os.path.join(dir_path, file))
-        case "date":
-            sort_func = lambda file: os.path.getctime(os.path.join(dir_path, file))
-        case "modified":
-            sort_func = lambda file: os.path.getmtime(os.path.join(dir_path, file))
-        case "type":
-            sort_func = lambda file: os.path.splitext(os.path.join(dir_path, file))[1]
-        case _:
-            sort_func = None
-    entries_list.sort(key=sort_func, reverse=desc)
-
+def _stream_entries_list(
+    dir_path: str, show_map: dict, show_hidden: bool, limit: int | None
+) -> Generator[str]:
+    entry_func = getattr(walker, show_map["entry_func_name"])
+    entries = (
+        entry
+        for entry in walker.iter_entries(dir_path)
+        if not should_skip_hidden(show_hidden, entry.name) and entry_func(entry)
+    )
+    abs_dir_path = os.path.abspath(dir_path)
+    yield from _stream_listing(
+        islice(entries, limit),
+        getattr(log_messages, show_map["header_msg"]).format(dir_path=abs_dir_path),
+        getattr(log_messages, show_map["not_found_msg"]).format(dir_path=abs_dir_path),
+    )
 
-#############################################################
-def scan(dir_path: str, show_hidden: bool, sort: str, desc: bool, save: bool, output: str, log: str) -> None:
-    logger = get_logger(output, save, log)
 
-    dir_list = os.listdir(dir_path)
+def _split_entries(
+    dir_path: str,
+    show_hidden: bool,
+    sort_key: SortKey | None,
+    desc: bool,
+    limit: int | None,
+    collect_subdirs: bool = False,
+) -> tuple[list[os.DirEntry], list[os.DirEntry], list[os.DirEntry]]:
     files_list = []
     nested_dirs = []
-    for entry in dir_list:
-        if should_skip_hidden(show_hidden, entry):
+    # NB: with --limit nested_dirs holds only the selected entries -> keep all of them for recursion
+    subdir_list = []
+    for entry in walker.iter_entries(dir_path):
+        if should_skip_hidden(show_hidden, entry.name):
             continue
-        if os.path.isfile(os.path.join(dir_path, entry)):
-            files_list.append(entry)
+        if walker.is_file(entry):
+            _add_to_selection(files_list, entry, sort_key, desc, limit)
         else:
-            nested_dirs.append(entry)
+            _add_to_selection(nested_dirs, entry, sort_key, desc, limit)
+            if collect_subdirs:
+                subdir_list.append(entry)
+    return files_list, nested_dirs, subdir_list
+
+
+def _get_sort_key(criteria: str | None, unsorted: bool = False) -> SortKey | None:
+    if unsorted:
+        return None
+
+    key_names = criteria.split(",") if criteria else ["name"]
+    key_funcs = [SORT_KEY_MAP[key_name] for key_name in key_names]
+    if not STAT_SORT_KEYS.intersection(key_names):
+        return lambda entry: tuple(func(entry, None) for func in key_funcs)
+
+    def sort_key(entry: os.DirEntry) -> tuple:
+        stat = entry.stat()
+        return tuple(func(entry, stat) for func in key_funcs)
+
+    return sort_key
+
+
+def _add_to_selection(
+    selection: list[os.DirEntry], entry: os.DirEntry, sort_key: SortKey | None, desc: bool, limit: int | None
+) -> None:
+    if sort_key is None:
+        # directory order -> the first 'limit' entries are final
+        if not limit or len(selection) < limit:
+            selection.append(entry)
+        return
+    selection.append(entry)
+    # prune back to the best 'limit' entries whenever the buffer doubles -> memory stays O(limit)
+    if limit and len(selection) >= 2 * limit:
+        selection[:] = _order_entries(selection, sort_key, desc, limit)
+
+
+def _order_entries(
+    entries: list[os.DirEntry], sort_key: SortKey | None, desc: bool, limit: int | None = None
+) -> list[os.DirEntry]:
+    if sort_key is None:
+        return entries[:limit]
+    # sorting computes each key once -> every entry is stat-ed at most once (and DirEntry caches it)
+    if not limit:
+        return sorted(entries, key=sort_key, reverse=desc)
+    # NB: nsmallest/nlargest equal sorted(...)[:limit] incl. the order of equal keys but use a bounded heap
+    select = heapq.nlargest if desc else heapq.nsmallest
+    return select(limit, entries, key=sort_key)
+
+
+#############################################################
+def scan(
+    dir_path: str,
+    show_hidden: bool,
+    sort: str,
+    desc: bool,
+    limit: int | None,
+    unsorted: bool,
+    save: bool,
+    output: str,
+    log: str,
+    output_format: str = records.TEXT,
+) -> None:
+    logger = get_logger(output, save, log)
+
+    if output_format != records.TEXT:
+        writer = records.RecordWriter(logger, output_format)
+        for entry in _iter_catalog_entries(dir_path, show_hidden, sort, desc, limit, unsorted):
+            writer.write_entry(entry)
+        return
 
-    for log_msg in _get_catalog_messages(dir_path, files_list, nested_dirs, sort, desc):
+    if unsorted:
+        log_gen = _stream_catalog(dir_path, show_hidden, limit)
+    else:
+        sort_key = _get_sort_key(sort)
+        files_list, nested_dirs, _ = _split_entries(dir_path, show_hidden, sort_key, desc, limit)
+        log_gen = _get_catalog_messages(dir_path, files_list, nested_dirs, sort_key, desc, limit)
+    for log_msg in log_gen:
         logger.info(log_msg)
 
 
+def _stream_catalog(dir_path: str, show_hidden: bool, limit: int | None) -> Generator[str]:
+    abs_dir_path = os.path.abspath(dir_path)
+    files, get_nested_dirs = _stream_split_entries(
+        dir_path, partial(_classify_catalog_entry, show_hidden=show_hidden)
+    )
+    yield from _stream_listing(
+        islice(files, limit),
+        log_messages.LISTED_FILES_HEADER.format(dir_path=abs_dir_path),
+        log_messages.NO_FILES.format(dir_path=abs_dir_path),
+    )
+    # NB: with --limit the files may be cut short -> stop reading the dir for them
+    files.close()
+    yield from _stream_listing(
+        islice(get_nested_dirs(), limit),
+        log_messages.NESTED_SUBDIRS_HEADER.format(dir_path=abs_dir_path),
+        log_messages.NO_SUBDIRS.format(dir_path=abs_dir_path),
+    )
+
+
+def _iter_catalog_entries(
+    dir_path: str, show_hidden: bool, sort: str, desc: bool, limit: int | None, unsorted: bool
+) -> Generator[os.DirEntry]:
+    if unsorted:
+        files, get_nested_dirs = _stream_split_entries(
+            dir_path, partial(_classify_catalog_entry, show_hidden=show_hidden)
+        )
+        yield from islice(files, limit)
+        files.close()
+        yield from islice(get_nested_dirs(), limit)
+        return
+
+    sort_key = _get_sort_key(sort)
+    files_list, nested_dirs, _ = _split_entries(dir_path, show_hidden, sort_key, desc, limit)
+    yield from _order_entries(files_list, sort_key, desc, limit)
+    yield from _order_entries(nested_dirs, sort_key, desc, limit)
+
+
+def _classify_catalog_entry(entry: os.DirEntry, show_hidden: bool) -> bool | None:
+    if should_skip_hidden(show_hidden, entry.name):
+        return None
+    return walker.is_file(entry)
+
+
 def scan_recursively(
-    dir_path: str, show_hidden: bool, sort: str, desc: bool, save: bool, output: str, log: str
+    dir_path: str,
+    show_hidden: bool,
+    sort: str,
+    desc: bool,
+    limit: int | None,
+    unsorted: bool,
+    save: bool,
+    output: str,
+    log: str,
+    jobs: int = 1,
+    output_format: str = records.TEXT,
 ) -> None:
     logger = get_logger(output, save, log)
-    for log_msg in _get_recursive_catalog(show_hidden, sort, desc, dir_path):
-        logger.info(log_msg)
+    sort_key = _get_sort_key(sort, unsorted)
+    if output_format == records.TEXT:
+        for log_msg in _get_recursive_catalog(show_hidden, sort_key, desc, limit, dir_path, jobs=jobs):
+            logger.info(log_msg)
+        return
+
+    writer = records.RecordWriter(logger, output_format)
+    for _, files_list, nested_dirs, _ in _walk_catalog(show_hidden, sort_key, desc, limit, dir_path, jobs):
+        for entry in chain(
+            _order_entries(files_list, sort_key, desc, limit),
+            _order_entries(nested_dirs, sort_key, desc, limit),
+        ):
+            writer.write_entry(entry)
 
 
 def _get_recursive_catalog(
-    show_hidden: bool, sort: str, desc: bool, root_dir: str, subdir_path: str | None = None
+    show_hidden: bool,
+    sort_key: SortKey | None,
+    desc: bool,
+    limit: int | None,
+    root_dir: str,
+    subdir_path: str | None = None,
+    jobs: int = 1,
 ) -> Generator[str]:
-    if subdir_path is None:
-        subdir_path = root_dir
+    for dir_path, files_list, nested_dirs, _ in _walk_catalog(
+        show_hidden, sort_key, desc, limit, subdir_path or root_dir, jobs
+    ):
+        yield from _get_catalog_messages(dir_path, files_list, nested_dirs, sort_key, desc, limit)
 
-    files_list = []
-    nested_dirs = []
-    subdir_list = os.listdir(subdir_path)
-    for entry in subdir_list:
-        if should_skip_hidden(show_hidden, entry):
-            continue
-        entry_path = os.path.join(subdir_path, entry)
-        if os.path.isfile(entry_path):
-            files_list.append(entry)
-        else:
-            nested_dirs.append(entry)
 
-    yield from _get_catalog_messages(subdir_path, files_list, nested_dirs, sort, desc)
-    for entry in nested_dirs:
-        yield from _get_recursive_catalog(show_hidden, sort, desc, root_dir, os.path.join(subdir_path, entry))
+def _walk_catalog(
+    show_hidden: bool, sort_key: SortKey | None, desc: bool, limit: int | None, root_dir: str, jobs: int
+) -> Generator[tuple[str, list[os.DirEntry], list[os.DirEntry], list[str]]]:
+    list_dir = partial(_list_catalog_dir, show_hidden=show_hidden, sort_key=sort_key, desc=desc, limit=limit)
+    return walker.walk_tree(root_dir, list_dir, itemgetter(3), jobs)
+
+
+def _list_catalog_dir(
+    dir_path: str, show_hidden: bool, sort_key: SortKey | None, desc: bool, limit: int | None
+) -> tuple[str, list[os.DirEntry], list[os.DirEntry], list[str]]:
+    files_list, nested_dirs, subdir_list = _split_entries(
+        dir_path, show_hidden, sort_key, desc, limit, collect_subdirs=True
+    )
+    # subdirs are walked (and reported) in sorted order
+    return (
+        dir_path,
+        files_list,
+        nested_dirs,
+        [entry.path for entry in _order_entries(subdir_list, sort_key, desc)],
+    )
 
 
 def _get_catalog_messages(
-    dir_path: str, files_list: list[str], nested_dirs: list[str], sort: str, desc: bool
+    dir_path: str,
+    files_list: list[os.DirEntry],
+    nested_dirs: list[os.DirEntry],
+    sort_key: SortKey | None,
+    desc: bool,
+    limit: int | None,
 ) -> tuple[str, str]:
     if not files_list:
         files_msg = log_messages.NO_FILES.format(dir_path=os.path.abspath(dir_path))
     else:
-        _sort_entries_list(dir_path, files_list, sort, desc)
         files_msg = log_messages.LISTED_FILES.format(
-            dir_path=os.path.abspath(dir_path), entries_list=_format_entries(files_list)
+            dir_path=os.path.abspath(dir_path),
+            entries_list=_format_entries(_order_entries(files_list, sort_key, desc, limit)),
         )
 
     if not nested_dirs:
         nested_dirs_msg = log_messages.NO_SUBDIRS.format(dir_path=os.path.abspath(dir_path))
     else:
-        _sort_entries_list(dir_path, nested_dirs, sort, desc)
         nested_dirs_msg = log_messages.NESTED_SUBDIRS.format(
-            dir_path=os.path.abspath(dir_path), entries_list=_format_entries(nested_dirs)
+            dir_path=os.path.abspath(dir_path),
+            entries_list=_format_entries(_order_entries(nested_dirs, sort_key, desc, limit)),
         )
     return files_msg, nested_dirs_msg
 
@@ -164,76 +374,174 @@ def _get_catalog_messages(
 def build_tree(
     dir_path: str,
     max_depth: int,
+    ignore: str,
     show_hidden: bool,
     dirs_only: bool,
     save: bool,
     output: str,
     log: str,
+    jobs: int = 1,
+    output_format: str = records.TEXT,
 ) -> None:
     logger = get_logger(output, save, log)
-    root_level = os.path.normpath(dir_path).count(os.sep)
     if max_depth is None:
         max_depth = 20
 
-    for curr_root, dirs, files in os.walk(dir_path):
-        if should_skip_hidden(show_hidden, os.path.basename(curr_root)):
+    writer = records.RecordWriter(logger, output_format) if output_format != records.TEXT else None
+    ignore_list = ignore.split(",") if ignore else []
+    list_dir = partial(_list_tree_dir, ignore_list=ignore_list, show_hidden=show_hidden)
+    get_subdirs = partial(_get_tree_subdirs, max_depth=max_depth)
+    # NB: depth is handed down from parent to child dirs instead of being recomputed from each path
+    for listing in walker.walk_tree((dir_path, 0), list_dir, get_subdirs, jobs):
+        if listing is None:
             continue
-
-        level = os.path.normpath(curr_root).count(os.sep) - root_level
-        if level > max_depth + 1:
+        if writer:
+            _write_tree_records(writer, listing, max_depth, show_hidden, dirs_only)
             continue
-
+        curr_root, level, subdirs, files = listing
         indent = " " * 4 * level
         logger.info(f"{indent}{FOLDER_EMOJI} {os.path.abspath(curr_root)}/\n")
-        # NB: we print subdirs from the next level (max_depth + 1) but not the files inside them ( level <= max_depth)
-        if not dirs_only and level <= max_depth:
-            sub_indent = " " * 4 * (level + 1)
+        sub_indent = " " * 4 * (level + 1)
+        if not dirs_only:
             _build_file_tree(files, show_hidden, sub_indent, logger)
 
+        if level < max_depth:
+            continue
+        # NB: we print subdirs from the next level (max_depth + 1) but not the files inside them
+        # -> list them right here instead of walking (and reading) them
+        for entry_path in subdirs:
+            logger.info(f"{sub_indent}{FOLDER_EMOJI} {os.path.abspath(entry_path)}/\n")
 
-def _build_file_tree(files: list[str], show_hidden: bool, sub_indent: str, logger: Logger) -> None:
+
+def _write_tree_records(
+    writer: records.RecordWriter,
+    listing: tuple[str, int, list[str], list[os.DirEntry]],
+    max_depth: int,
+    show_hidden: bool,
+    dirs_only: bool,
+) -> None:
+    curr_root, level, subdirs, files = listing
+    writer.write_path(curr_root)
+    if not dirs_only:
+        for entry in files:
+            if not should_skip_hidden(show_hidden, entry.name):
+                writer.write_entry(entry)
+    if level >= max_depth:
+        for entry_path in subdirs:
+            writer.write_path(entry_path)
+
+
+def _list_tree_dir(
+    dir_item: tuple[str, int], ignore_list: list[str], show_hidden: bool
+) -> tuple[str, int, list[str], list[os.DirEntry]] | None:
+    dir_path, level = dir_item
+    # mirror os.walk -> unreadable dirs are left out silently
+    try:
+        entries = walker.list_entries(dir_path)
+    except OSError:
+        return None
+
+    subdirs = []
+    files = []
+    for entry in entries:
+        if not walker.is_dir(entry):
+            files.append(entry)
+        # prune right away -> hidden or ignored subtrees are never listed at all
+        elif not (_should_skip_tree_dir(entry.name, ignore_list, show_hidden) or entry.is_symlink()):
+            subdirs.append(entry.path)
+    return dir_path, level, subdirs, files
+
+
+def _get_tree_subdirs(
+    listing: tuple[str, int, list[str], list[os.DirEntry]] | None, max_depth: int
+) -> list[tuple[str, int]]:
+    if listing is None or listing[1] >= max_depth:
+        return []
+    _, level, subdirs, _ = listing
+    return [(subdir, level + 1) for subdir in subdirs]
+
+
+def _should_skip_tree_dir(entry: str, ignore_list: list[str], show_hidden: bool) -> bool:
+    return should_skip_hidden(show_hidden, entry) or entry in ignore_list
+
+
+def _build_file_tree(
+    files: list[os.DirEntry], show_hidden: bool, sub_indent: str, logger: OutputSink
+) -> None:
     for file in files:
-        if should_skip_hidden(show_hidden, file):
+        if should_skip_hidden(show_hidden, file.name):
             continue
-        logger.info(f"{sub_indent}{FILE_EMOJI} {file}\n")
+        logger.info(f"{sub_indent}{FILE_EMOJI} {file.name}\n")
 
 
 #############################################################
-def search(dir_path: str, name: str, use_regex: bool, save: bool, output: str, log: str) -> None:
+def search(
+    dir_path: str,
+    patterns: list[str],
+    use_regex: bool,
+    save: bool,
+    output: str,
+    log: str,
+    output_format: str = records.TEXT,
+) -> None:
     logger = get_logger(output, save, log)
+    name_matcher = NameMatcher(patterns, use_regex)
+    if output_format != records.TEXT:
+        writer = records.RecordWriter(logger, output_format)
+        files, get_nested_dirs = _stream_split_entries(
+            dir_path, partial(_classify_search_entry, name_matcher=name_matcher)
+        )
+        for entry in chain(files, get_nested_dirs()):
+            writer.write_entry(entry, name_matcher.get_status(entry.name))
+        return
 
-    dir_list = os.listdir(dir_path)
-    files_list = []
-    nested_dirs = []
-    for entry in dir_list:
-        if _search_in_entry_name(name, entry, use_regex):
-            if os.path.isfile(os.path.join(dir_path, entry)):
-                files_list.append(entry)
-            else:
-                nested_dirs.append(entry)
+    for log_msg in _stream_search(dir_path, name_matcher):
+        logger.info(log_msg)
 
-    if not files_list and not nested_dirs:
-        logger.info(log_messages.NOT_FOUND)
-        return
 
-    logger.info(log_messages.FOUND_BY_NAME.format(dir_path=os.path.abspath(dir_path), keyword=name))
-    if files_list:
-        logger.info(log_messages.FOUND_FILES_BY_NAME.format(files_list=_format_entries(files_list)))
-    if nested_dirs:
-        logger.info(log_messages.FOUND_DIRS_BY_NAME.format(subdir_list=_format_entries(nested_dirs)))
+def _stream_search(dir_path: str, name_matcher: NameMatcher) -> Generator[str]:
+    classify = partial(_classify_search_entry, name_matcher=name_matcher)
+    files, get_nested_dirs = _stream_split_entries(dir_path, classify)
+
+    found_msg = _get_found_msg(dir_path, name_matcher)
+    has_files = yield from _stream_section(
+        files, found_msg + log_messages.FOUND_FILES_HEADER, name_matcher.describe, FILTERED_CHUNK_SIZE
+    )
+    dirs_header = log_messages.FOUND_DIRS_HEADER if has_files else found_msg + log_messages.FOUND_DIRS_HEADER
+    has_dirs = yield from _stream_section(
+        get_nested_dirs(), dirs_header, name_matcher.describe, FILTERED_CHUNK_SIZE
+    )
+    if not (has_files or has_dirs):
+        yield log_messages.NOT_FOUND
+
+
+def _classify_search_entry(entry: os.DirEntry, name_matcher: NameMatcher) -> bool | None:
+    if not name_matcher.search(entry.name):
+        return None
+    return walker.is_file(entry)
 
 
 def search_recursively(
     root_dir: str,
-    name: str,
+    patterns: list[str],
     use_regex: bool,
     save: bool,
     output: str,
     log: str,
     subdir_path: str | None = None,
+    jobs: int = 1,
+    output_format: str = records.TEXT,
 ) -> None:
     logger = get_logger(output, save, log)
-    log_gen = _search_recursively(root_dir, name, use_regex, subdir_path)
+    name_matcher = NameMatcher(patterns, use_regex)
+    if output_format != records.TEXT:
+        writer = records.RecordWriter(logger, output_format)
+        for _, files_list, valid_dirs, _ in _walk_search(root_dir, name_matcher, subdir_path, jobs):
+            for entry in chain(files_list, valid_dirs):
+                writer.write_entry(entry, name_matcher.get_status(entry.name))
+        return
+
+    log_gen = _search_recursively(root_dir, name_matcher, subdir_path, jobs)
     if not (log_msg := next(log_gen, None)):
         logger.info(log_messages.NOT_FOUND)
     else:
@@ -243,43 +551,290 @@ def search_recursively(
 
 
 def _search_recursively(
-    root_dir: str, name: str, use_regex: bool, subdir_path: str | None = None
+    root_dir: str, name_matcher: NameMatcher, subdir_path: str | None = None, jobs: int = 1
 ) -> Generator[str]:
-    if subdir_path is None:
-        subdir_path = root_dir
-    subdir_list = os.listdir(subdir_path)
+    for dir_path, files_list, valid_dirs, _ in _walk_search(root_dir, name_matcher, subdir_path, jobs):
+        if files_list or valid_dirs:
+            yield from _get_found_messages(
+                dir_path,
+                name_matcher,
+                [entry.name for entry in files_list],
+                [entry.name for entry in valid_dirs],
+            )
+
+
+def _get_found_msg(dir_path: str, name_matcher: NameMatcher) -> str:
+    if name_matcher.is_multi:
+        curr_log = log_messages.FOUND_BY_PATTERNS if name_matcher.use_regex else log_messages.FOUND_BY_NAMES
+        sequence = ", ".join(f"'{pattern}'" for pattern in name_matcher.patterns)
+    else:
+        curr_log = log_messages.FOUND_BY_PATTERN if name_matcher.use_regex else log_messages.FOUND_BY_NAME
+        sequence = name_matcher.patterns[0]
+    return curr_log.format(dir_path=os.path.abspath(dir_path), sequence=sequence)
 
+
+def _get_found_messages(
+    dir_path: str, name_matcher: NameMatcher, file_names: list[str], dir_names: list[str]
+) -> Generator[str]:
+    yield _get_found_msg(dir_path, name_matcher)
+    if file_names:
+        files_list = "\n\t- ".join(name_matcher.describe(file_name) for file_name in file_names)
+        yield log_messages.FOUND_FILES_BY_NAME.format(files_list=files_list)
+    if dir_names:
+        subdir_list = "\n\t- ".join(name_matcher.describe(dir_name) for dir_name in dir_names)
+        yield log_messages.FOUND_DIRS_BY_NAME.format(subdir_list=subdir_list)
+    yield log_messages.DELIMITER
+
+
+def _walk_search(
+    root_dir: str, name_matcher: NameMatcher, subdir_path: str | None, jobs: int
+) -> Generator[tuple[str, list[os.DirEntry], list[os.DirEntry], list[str]]]:
+    list_dir = partial(_search_in_dir, name_matcher=name_matcher)
+    return walker.walk_tree(subdir_path or root_dir, list_dir, itemgetter(3), jobs)
+
+
+def _search_in_dir(
+    dir_path: str, name_matcher: NameMatcher
+) -> tuple[str, list[os.DirEntry], list[os.DirEntry], list[str]]:
     files_list = []
-    nested_dirs = []
     valid_dirs = []
-    for entry in subdir_list:
-        entry_path = os.path.join(subdir_path, entry)
-        if os.path.isfile(entry_path) and _search_in_entry_name(name, entry, use_regex):
-            files_list.append(entry)
-        elif os.path.isdir(entry_path):
-            if _search_in_entry_name(name, entry, use_regex):
+    nested_dirs = []
+    for entry in walker.iter_entries(dir_path):
+        if walker.is_file(entry):
+            if name_matcher.search(entry.name):
+                files_list.append(entry)
+        elif walker.is_dir(entry):
+            if name_matcher.search(entry.name):
                 valid_dirs.append(entry)
-            nested_dirs.append(entry)
+            nested_dirs.append(entry.path)
+    return dir_path, files_list, valid_dirs, nested_dirs
+
+
+def find_entries(
+    dir_path: str,
+    entry_filter: EntryFilter,
+    recursively: bool,
+    save: bool,
+    output: str,
+    log: str,
+    jobs: int = 1,
+    output_format: str = records.TEXT,
+) -> None:
+    logger = get_logger(output, save, log)
+    if output_format != records.TEXT:
+        writer = records.RecordWriter(logger, output_format)
+        if recursively:
+            matches = (
+                chain(files_list, dirs_list)
+                for _, files_list, dirs_list, _ in _walk_find(dir_path, entry_filter, jobs)
+            )
+            entries = chain.from_iterable(matches)
+        else:
+            files, get_nested_dirs = _stream_split_entries(dir_path, entry_filter)
+            entries = chain(files, get_nested_dirs())
+        for entry in entries:
+            # NB: stat-ed by the filter already when size or time predicates are given
+            writer.write_entry(entry)
+        return
 
-    log_msg = []
-    if files_list or valid_dirs:
-        curr_log = log_messages.FOUND_BY_PATTERN if use_regex else log_messages.FOUND_BY_NAME
-        log_msg.append(curr_log.format(dir_path=os.path.abspath(subdir_path), sequence=name))
+    log_gen = (
+        _find_recursively(dir_path, entry_filter, jobs)
+        if recursively
+        else _stream_find(dir_path, entry_filter)
+    )
+    is_found = False
+    for log_msg in log_gen:
+        logger.info(log_msg)
+        is_found = True
+    if not is_found:
+        logger.info(log_messages.NOT_FOUND)
+
+
+def _stream_find(dir_path: str, entry_filter: EntryFilter) -> Generator[str]:
+    files, get_nested_dirs = _stream_split_entries(dir_path, entry_filter)
+    found_msg = log_messages.FOUND_BY_FILTERS.format(dir_path=os.path.abspath(dir_path))
+    has_files = yield from _stream_section(
+        files, found_msg + log_messages.MATCHED_FILES_HEADER, chunk_size=FILTERED_CHUNK_SIZE
+    )
+    dirs_header = (
+        log_messages.MATCHED_DIRS_HEADER if has_files else found_msg + log_messages.MATCHED_DIRS_HEADER
+    )
+    if (
+        yield from _stream_section(get_nested_dirs(), dirs_header, chunk_size=FILTERED_CHUNK_SIZE)
+    ) or has_files:
+        yield log_messages.DELIMITER
+
+
+def _find_recursively(dir_path: str, entry_filter: EntryFilter, jobs: int) -> Generator[str]:
+    for curr_dir, files_list, dirs_list, _ in _walk_find(dir_path, entry_filter, jobs):
+        if not (files_list or dirs_list):
+            continue
+        yield log_messages.FOUND_BY_FILTERS.format(dir_path=os.path.abspath(curr_dir))
         if files_list:
-            log_msg.append(log_messages.FOUND_FILES_BY_NAME.format(files_list=_format_entries(files_list)))
-        if valid_dirs:
-            log_msg.append(log_messages.FOUND_DIRS_BY_NAME.format(subdir_list=_format_entries(valid_dirs)))
-        log_msg.append(log_messages.DELIMITER)
+            yield log_messages.MATCHED_FILES_HEADER + log_messages.ENTRY_LINE.format(
+                entry=_format_entries(files_list)
+            )
+        if dirs_list:
+            yield log_messages.MATCHED_DIRS_HEADER + log_messages.ENTRY_LINE.format(
+                entry=_format_entries(dirs_list)
+            )
+        yield log_messages.DELIMITER
+
+
+def _walk_find(
+    dir_path: str, entry_filter: EntryFilter, jobs: int
+) -> Generator[tuple[str, list[os.DirEntry], list[os.DirEntry], list[str]]]:
+    list_dir = partial(_find_in_dir, entry_filter=entry_filter)
+    return walker.walk_tree(dir_path, list_dir, itemgetter(3), jobs)
+
+
+def _find_in_dir(
+    dir_path: str, entry_filter: EntryFilter
+) -> tuple[str, list[os.DirEntry], list[os.DirEntry], list[str]]:
+    # NB: runs in the walker threads -> the stat calls of the filter overlap with the listing of other dirs
+    files_list = []
+    dirs_list = []
+    nested_dirs = []
+    for entry in walker.iter_entries(dir_path):
+        if (is_file := entry_filter(entry)) is not None:
+            (files_list if is_file else dirs_list).append(entry)
+        # symlinked dirs may match but are not followed -> no loops
+        if not is_file and walker.is_dir(entry) and not entry.is_symlink():
+            nested_dirs.append(entry.path)
+    return dir_path, files_list, dirs_list, nested_dirs
+
+
+def search_content(
+    dir_path: str,
+    patterns: list[str],
+    use_regex: bool,
+    recursively: bool,
+    max_count: int | None,
+    save: bool,
+    output: str,
+    log: str,
+    jobs: int = 1,
+    output_format: str = records.TEXT,
+) -> None:
+    logger = get_logger(output, save, log)
+    pattern = content.compile_pattern(patterns, use_regex)
+    file_paths = _walk_content_files(dir_path, recursively, jobs)
+    results = content.search_files(file_paths, pattern, max_count, jobs)
+    if output_format != records.TEXT:
+        writer = records.RecordWriter(logger, output_format)
+        for file_path, hits in results:
+            for line_no, offset, _ in hits:
+                writer.write_path(file_path, f"{line_no}:{offset}")
+        return
+
+    found_msg = _get_found_msg(dir_path, NameMatcher(patterns, use_regex))
+    is_found = False
+    for file_path, hits in results:
+        if hits and not is_found:
+            logger.info(found_msg)
+            logger.info(log_messages.FOUND_CONTENTS_HEADER)
+            is_found = True
+        for line_no, offset, text in hits:
+            logger.info(
+                log_messages.CONTENT_MATCH.format(
+                    path=file_path, line_no=line_no, offset=offset, text=text.decode(errors="replace")
+                )
+            )
+    logger.info(log_messages.DELIMITER if is_found else log_messages.NOT_FOUND)
+
+
+def _walk_content_files(dir_path: str, recursively: bool, jobs: int) -> Generator[str]:
+    if not recursively:
+        yield from (entry.path for entry in walker.iter_entries(dir_path) if walker.is_file(entry))
+        return
+    # NB: listings are read ahead by the walker threads while the files of earlier dirs are scanned
+    for _, file_paths, _ in walker.walk_tree(dir_path, _list_content_dir, itemgetter(2), jobs):
+        yield from file_paths
+
+
+def _list_content_dir(dir_path: str) -> tuple[str, list[str], list[str]]:
+    file_paths = []
+    nested_dirs = []
+    for entry in walker.iter_entries(dir_path):
+        if walker.is_file(entry):
+            file_paths.append(entry.path)
+        elif walker.is_dir(entry):
+            nested_dirs.append(entry.path)
+    return dir_path, file_paths, nested_dirs
+
+
+def search_in_index(
+    dir_path: str,
+    patterns: list[str],
+    use_regex: bool,
+    recursively: bool,
+    save: bool,
+    output: str,
+    log: str,
+    output_format: str = records.TEXT,
+) -> None:
+    logger = get_logger(output, save, log)
+
+    abs_dir_path = os.path.abspath(dir_path)
+    if not (index_path := name_index.find_index_path(abs_dir_path)):
+        logger.info(log_messages.INDEX_NOT_FOUND.format(dir_path=abs_dir_path))
+        return
 
-    yield from log_msg
-    for entry in nested_dirs:
-        yield from _search_recursively(root_dir, name, use_regex, os.path.join(subdir_path, entry))
+    name_matcher = NameMatcher(patterns, use_regex)
+    with name_index.NameIndex(index_path) as index:
+        matches = index.search(abs_dir_path, name_matcher, recursively)
+        if output_format != records.TEXT:
+            writer = records.RecordWriter(logger, output_format)
+            for entry_dir, entry_name, _ in matches:
+                writer.write_path(os.path.join(entry_dir, entry_name), name_matcher.get_status(entry_name))
+            return
 
+        is_found = False
+        for entry_dir, group in groupby(matches, key=itemgetter(0)):
+            file_names = []
+            dir_names = []
+            for _, entry_name, is_dir in group:
+                (dir_names if is_dir else file_names).append(entry_name)
+            for log_msg in _get_found_messages(entry_dir, name_matcher, file_names, dir_names):
+                logger.info(log_msg)
+            is_found = True
+        if not is_found:
+            logger.info(log_messages.NOT_FOUND)
 
-def _search_in_entry_name(name: str, entry: str, use_regex: bool):
-    if use_regex:
-        return re.search(name, entry)
-    return name in entry
+
+#############################################################
+def build_index(dir_path: str, save: bool, output: str, log: str) -> None:
+    logger = get_logger(output, save, log)
+
+    abs_dir_path = os.path.abspath(dir_path)
+    index_path = name_index.get_index_path(abs_dir_path)
+    with name_index.NameIndex(index_path) as index:
+        listed_dirs = index.update(abs_dir_path)
+        dirs_count, entries_count = index.count()
+    logger.info(
+        log_messages.INDEX_UPDATED.format(
+            dir_path=abs_dir_path,
+            entries=entries_count,
+            dirs=dirs_count,
+            listed_dirs=listed_dirs,
+            index_path=index_path,
+        )
+    )
+
+
+#############################################################
+def snapshot(dir_path: str, manifest_path: str, hash_algorithm: str | None, jobs: int) -> None:
+    # NB: -o names the manifest here -> messages are only printed
+    logger = get_logger(os.getcwd(), False, "snapshot.log")
+
+    abs_dir_path = os.path.abspath(dir_path)
+    abs_manifest_path = os.path.abspath(manifest_path)
+    count = manifest.write_manifest(abs_dir_path, abs_manifest_path, hash_algorithm, jobs)
+    logger.info(
+        log_messages.SNAPSHOT_WRITTEN.format(
+            count=count, dir_path=abs_dir_path, manifest_path=abs_manifest_path
+        )
+    )
 
 
 #############################################################
@@ -294,6 +849,10 @@ def compare_directories(
     save: bool,
     output: str,
     log: str,
+    output_format: str = records.TEXT,
+    deep: bool = False,
+    jobs: int = 1,
+    detect_moves: bool = False,
 ) -> None:
     logger = get_logger(output, save, log)
 
@@ -307,40 +866,133 @@ def compare_directories(
         return
 
     ignore_list = ignore.split(",") if ignore else []
-    cmp_obj = dircmp(abs_dir_path, abs_other_path, ignore=ignore_list)
-    _diff_report(cmp_obj, show_hidden, recursively, short, one_line, logger)
+    writer = records.RecordWriter(logger, output_format) if output_format != records.TEXT else None
+    if os.path.isfile(abs_dir_path) or os.path.isfile(abs_other_path):
+        if detect_moves:
+            logger.info(log_messages.MOVES_NEED_DIRS)
+            return
+        # NB: a manifest on any side -> both are read as sorted records and merged
+        with (
+            manifest.TreeSource(abs_dir_path, jobs) as left,
+            manifest.TreeSource(abs_other_path, jobs) as right,
+        ):
+            cmp_objs = manifest.walk_manifest_diff(left, right, ignore_list, show_hidden, recursively)
+            _write_diff_output(cmp_objs, show_hidden, short, one_line, writer, logger)
+        return
+    if deep:
+        cmp_objs = deep_compare.walk_deep_diff(
+            abs_dir_path, abs_other_path, ignore_list, show_hidden, recursively, jobs
+        )
+    else:
+        cmp_obj = dircmp(abs_dir_path, abs_other_path, ignore=ignore_list)
+        cmp_objs = _iter_diff_tree(cmp_obj, show_hidden, recursively)
+    if not detect_moves:
+        _write_diff_output(cmp_objs, show_hidden, short, one_line, writer, logger)
+        return
+
+    # files of one side only are collected while the diff is reported -> matched once the tree is done
+    left_files = []
+    right_files = []
+    cmp_objs = _collect_only_files(cmp_objs, show_hidden, left_files, right_files)
+    _write_diff_output(cmp_objs, show_hidden, short, one_line, writer, logger)
+    with hasher.HashPool(jobs=jobs) as hash_pool:
+        moves = move_detector.find_moves(left_files, right_files, hash_pool)
+    _report_moves(abs_dir_path, abs_other_path, moves, short, one_line, writer, logger)
+
+
+def _collect_only_files(
+    cmp_objs: Iterable[DirComparison],
+    show_hidden: bool,
+    left_files: list[move_detector.FileStat],
+    right_files: list[move_detector.FileStat],
+) -> Generator[DirComparison]:
+    for cmp_obj in cmp_objs:
+        left_files.extend(move_detector.iter_only_files(cmp_obj.left, cmp_obj.left_only, show_hidden))
+        right_files.extend(move_detector.iter_only_files(cmp_obj.right, cmp_obj.right_only, show_hidden))
+        yield cmp_obj
+
+
+def _report_moves(
+    left_root: str,
+    right_root: str,
+    moves: list[tuple[str, str]],
+    short: bool,
+    one_line: bool,
+    writer: records.RecordWriter | None,
+    logger: OutputSink,
+) -> None:
+    if writer:
+        for left_path, right_path in moves:
+            writer.write_path(left_path, log_messages.MOVE_STATUS.format(path=right_path))
+        return
+
+    logger.info(log_messages.DIRS_MOVES.format(left=left_root, right=right_root))
+    if not moves:
+        logger.info(log_messages.NO_MOVES)
+        return
+    entries = [
+        log_messages.MOVE_ENTRY.format(
+            left=os.path.relpath(left_path, left_root), right=os.path.relpath(right_path, right_root)
+        )
+        for left_path, right_path in moves
+    ]
+    delimiter, func = _get_report_format(short, one_line)
+    _handle_stats_entries(None, entries, logger, log_messages.MOVED_FILES, delimiter, func)
+
+
+def _write_diff_output(
+    cmp_objs: Iterable[DirComparison],
+    show_hidden: bool,
+    short: bool,
+    one_line: bool,
+    writer: records.RecordWriter | None,
+    logger: OutputSink,
+) -> None:
+    if writer:
+        for cmp_obj in cmp_objs:
+            _write_diff_records(cmp_obj, show_hidden, writer)
+        return
+    _diff_report(cmp_objs, show_hidden, short, one_line, logger)
 
 
 def _diff_report(
-    cmp_obj: dircmp,
+    cmp_objs: Iterable[DirComparison],
     show_hidden: bool,
-    diff_recursively: bool,
     short: bool,
     one_line: bool,
-    logger: Logger,
+    logger: OutputSink,
 ) -> None:
-    _report(cmp_obj, show_hidden, short, one_line, logger)
+    for cmp_obj in cmp_objs:
+        _report(cmp_obj, show_hidden, short, one_line, logger)
 
-    if diff_recursively:
-        for sub_dir in cmp_obj.subdirs.values():
-            if should_skip_hidden(show_hidden, sub_dir.left, sub_dir.right):
-                continue
-            _diff_report(sub_dir, show_hidden, diff_recursively, short, one_line, logger)
 
+def _iter_diff_tree(cmp_obj: dircmp, show_hidden: bool, diff_recursively: bool) -> Generator[dircmp]:
+    cmp_stack = [cmp_obj]
+    while cmp_stack:
+        cmp_obj = cmp_stack.pop()
+        yield cmp_obj
+        if diff_recursively:
+            cmp_stack.extend(
+                sub_dir
+                for sub_dir in reversed(cmp_obj.subdirs.values())
+                if not should_skip_hidden(show_hidden, sub_dir.left, sub_dir.right)
+            )
 
-def _report(cmp_obj: dircmp, show_hidden: bool, short: bool, one_line: bool, logger: Logger) -> None:
-    logger.info(log_messages.DIRS_DIFF.format(left=cmp_obj.left, right=cmp_obj.right))
 
-    if short:
-        delimiter = ": "
-        func = lambda files: len(files)
-    elif one_line:
-        delimiter = ":\n\t"
-        func = lambda files: files
-    else:
-        delimiter = ":\n\t- "
-        func = lambda files: "\n\t- ".join(files)
+def _write_diff_records(cmp_obj: DirComparison, show_hidden: bool, writer: records.RecordWriter) -> None:
+    for attr in STATS_MAP:
+        dir_path = cmp_obj.right if attr == "right_only" else cmp_obj.left
+        for entry in sorted(getattr(cmp_obj, attr, None) or []):
+            if not should_skip_hidden(show_hidden, entry):
+                writer.write_path(os.path.join(dir_path, entry), attr)
+
+
+def _report(
+    cmp_obj: DirComparison, show_hidden: bool, short: bool, one_line: bool, logger: OutputSink
+) -> None:
+    logger.info(log_messages.DIRS_DIFF.format(left=cmp_obj.left, right=cmp_obj.right))
 
+    delimiter, func = _get_report_format(short, one_line)
     for attr in STATS_MAP:
         if not (stats := getattr(cmp_obj, attr, None)):
             continue
@@ -359,10 +1011,18 @@ def _report(cmp_obj: dircmp, show_hidden: bool, short: bool, one_line: bool, log
         _handle_stats_entries(dir_path, stats, logger, STATS_MAP[attr], delimiter, func)
 
 
+def _get_report_format(short: bool, one_line: bool) -> tuple[str, Callable[[list[str]], str | int]]:
+    if short:
+        return ": ", lambda files: len(files)
+    if one_line:
+        return ":\n\t", lambda files: files
+    return ":\n\t- ", lambda files: "\n\t- ".join(files)
+
+
 def _handle_stats_entries(
     dir_path: str,
     entries: list[str],
-    logger: Logger,
+    logger: OutputSink,
     message: str,
     delimiter: str,
     func: Callable[[list[str]], str | int],
@@ -376,5 +1036,58 @@ def _handle_stats_entries(
 
 
 # ### helpers ###
-def _format_entries(entries: list[str]) -> str:
-    return "\n\t- ".join(entries)
+def _format_entries(entries: list[os.DirEntry]) -> str:
+    return "\n\t- ".join(entry.name for entry in entries)
+
+
+def _stream_split_entries(
+    dir_path: str, classify: Classifier
+) -> tuple[Generator[os.DirEntry], Callable[[], Iterable[os.DirEntry]]]:
+    # NB: entries of the second section are set aside (up to one chunk) while the first one is streamed
+    # -> if there are more of them or the first section was cut short the dir is read once again
+    second_section = []
+    is_complete = False
+
+    def iter_first_section() -> Generator[os.DirEntry]:
+        nonlocal is_complete
+        for entry in walker.iter_entries(dir_path):
+            if (is_first := classify(entry)) is None:
+                continue
+            if is_first:
+                yield entry
+            elif len(second_section) <= STREAM_CHUNK_SIZE:
+                second_section.append(entry)
+        is_complete = True
+
+    def get_second_section() -> Iterable[os.DirEntry]:
+        if is_complete and len(second_section) <= STREAM_CHUNK_SIZE:
+            return second_section
+        return (entry for entry in walker.iter_entries(dir_path) if classify(entry) is False)
+
+    return iter_first_section(), get_second_section
+
+
+def _stream_listing(entries: Iterable[os.DirEntry], header: str, not_found_msg: str) -> Generator[str]:
+    if (yield from _stream_section(entries, header)):
+        yield log_messages.DELIMITER
+    else:
+        yield not_found_msg
+
+
+def _stream_section(
+    entries: Iterable[os.DirEntry],
+    header: str,
+    describe: Callable[[str], str] | None = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Generator[str, None, bool]:
+    entries = iter(entries)
+    has_entries = False
+    while chunk := list(islice(entries, chunk_size)):
+        if not has_entries:
+            yield header
+            has_entries = True
+        names = (
+            (entry.name for entry in chunk) if describe is None else (describe(entry.name) for entry in chunk)
+        )
+        yield "".join(log_messages.ENTRY_LINE.format(entry=name) for name in names)
+    return has_entries
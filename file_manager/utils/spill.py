@@ -0,0 +1,106 @@
+import heapq
+import marshal
+import os
+import struct
+import tempfile
+from collections.abc import Generator, Iterable, Iterator
+from typing import Any, BinaryIO
+
+# rough upper bound of the memory held by one buffered record (tuple + ints + hex digest + list slot)
+RECORD_SIZE = 256
+# max number of runs merged at once -> keeps open files and read buffers bounded
+MAX_FAN_IN = 128
+READ_BUFFER_SIZE = 64 * 1024
+PATH_LENGTH = struct.Struct(">I")
+
+
+class SortedRuns:
+    def __init__(self, temp_dir: str, max_records: int) -> None:
+        self._temp_dir = temp_dir
+        self._max_records = max(max_records, 1)
+        self._buffer: list[tuple] = []
+        self._run_paths: list[str] = []
+
+    def add(self, record: tuple) -> None:
+        self._buffer.append(record)
+        if len(self._buffer) >= self._max_records:
+            self._run_paths.append(self._write_run(sorted(self._buffer)))
+            self._buffer = []
+
+    def __iter__(self) -> Iterator[tuple]:
+        # NB: merge in several passes if needed -> never more than MAX_FAN_IN runs are open
+        while len(self._run_paths) > MAX_FAN_IN:
+            merged = heapq.merge(*(_read_run(path) for path in self._run_paths[:MAX_FAN_IN]))
+            self._run_paths = self._run_paths[MAX_FAN_IN:] + [self._write_run(merged)]
+        self._buffer.sort()
+        runs = [_read_run(path) for path in self._run_paths]
+        buffer, self._buffer, self._run_paths = self._buffer, [], []
+        return heapq.merge(*runs, buffer)
+
+    def _write_run(self, records: Iterable[tuple]) -> str:
+        fd, run_path = tempfile.mkstemp(suffix=".run", dir=self._temp_dir)
+        with os.fdopen(fd, "wb") as f:
+            dump_records(records, f)
+        return run_path
+
+
+class PathTable:
+    # paths are kept on disk, records refer to them by their offset inside the table
+    def __init__(self, temp_dir: str) -> None:
+        self._file = open(os.path.join(temp_dir, "paths"), "w+b")
+        self._offset = 0
+
+    def __enter__(self) -> "PathTable":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._file.close()
+
+    def add(self, path: str) -> int:
+        data = os.fsencode(path)
+        path_id = self._offset
+        self._file.write(PATH_LENGTH.pack(len(data)))
+        self._file.write(data)
+        self._offset += PATH_LENGTH.size + len(data)
+        return path_id
+
+    def get(self, path_id: int) -> str:
+        self._file.seek(path_id)
+        (length,) = PATH_LENGTH.unpack(self._file.read(PATH_LENGTH.size))
+        path = os.fsdecode(self._file.read(length))
+        self._file.seek(self._offset)
+        return path
+
+
+def group_sorted(records: Iterable[tuple], key_length: int) -> Generator[list[tuple]]:
+    # yield runs of records sharing the same leading key fields, skipping unique ones
+    group = []
+    for record in records:
+        if group and record[:key_length] != group[0][:key_length]:
+            if len(group) > 1:
+                yield group
+            group = []
+        group.append(record)
+    if len(group) > 1:
+        yield group
+
+
+def dump_records(records: Iterable[Any], f: BinaryIO) -> None:
+    for record in records:
+        marshal.dump(record, f)
+
+
+def load_records(f: BinaryIO) -> Generator[Any]:
+    while True:
+        try:
+            yield marshal.load(f)
+        except EOFError:
+            return
+
+
+def _read_run(run_path: str) -> Generator[tuple]:
+    try:
+        with open(run_path, "rb", buffering=READ_BUFFER_SIZE) as f:
+            yield from load_records(f)
+    finally:
+        os.remove(run_path)
@@ -0,0 +1,77 @@
+import os
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+Item = TypeVar("Item")
+Listing = TypeVar("Listing")
+
+# listings handed out per worker ahead of the one being consumed -> bounded memory with busy workers
+PENDING_PER_WORKER = 4
+
+
+# NB: os.DirEntry caches the d_type reported by the directory listing and performs stat lazily (once)
+# -> classifying entries costs no extra syscalls, only sort keys and filters touching stat() do
+def iter_entries(dir_path: str) -> Generator[os.DirEntry]:
+    with os.scandir(dir_path) as it:
+        yield from it
+
+
+def list_entries(dir_path: str) -> list[os.DirEntry]:
+    with os.scandir(dir_path) as it:
+        return list(it)
+
+
+# mirror os.path.isfile/isdir -> errors while resolving an entry are reported as 'no match'
+def is_file(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_file()
+    except OSError:
+        return False
+
+
+def is_dir(entry: os.DirEntry) -> bool:
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+# yield list_dir() of every dir in pre-order -> subdirs of each listing are walked in the returned order
+def walk_tree(
+    root: Item,
+    list_dir: Callable[[Item], Listing],
+    get_subdirs: Callable[[Listing], list[Item]],
+    jobs: int = 1,
+) -> Generator[Listing]:
+    if jobs == 1:
+        dir_stack = [root]
+        while dir_stack:
+            listing = list_dir(dir_stack.pop())
+            yield listing
+            dir_stack.extend(reversed(get_subdirs(listing)))
+        return
+
+    # NB: idle workers list the dirs that come next in pre-order (shared queue -> no worker sits idle while
+    # others have a backlog) while the stack hands the listings back in order
+    # -> at most max_pending listings wait for the consumer, however wide the tree is
+    max_pending = jobs * PENDING_PER_WORKER
+    executor = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        # [item, future or None until submitted]
+        dir_stack = [[root, None]]
+        pending = 0
+        while dir_stack:
+            # the top of the stack is walked next -> submit from there down until the window is full
+            for slot in reversed(dir_stack):
+                if pending >= max_pending:
+                    break
+                if slot[1] is None:
+                    slot[1] = executor.submit(list_dir, slot[0])
+                    pending += 1
+            listing = dir_stack.pop()[1].result()
+            pending -= 1
+            yield listing
+            dir_stack.extend([subdir, None] for subdir in reversed(get_subdirs(listing)))
+    finally:
+        executor.shutdown(cancel_futures=True)
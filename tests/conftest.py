@@ -0,0 +1,22 @@
+import pytest
+from click.testing import CliRunner
+
+from file_manager.cli import fm
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> str:
+    # keep hash caches and name indexes of the tests away from the user's cache
+    cache_dir = str(tmp_path_factory.mktemp("cache"))
+    monkeypatch.setenv("XDG_CACHE_HOME", cache_dir)
+    return cache_dir
+
+
+@pytest.fixture
+def run_fm():
+    def run(*args: str):
+        result = CliRunner().invoke(fm, [str(arg) for arg in args], catch_exceptions=False)
+        assert result.exit_code == 0, result.output
+        return result
+
+    return run
@@ -0,0 +1,68 @@
+import mmap
+
+import pytest
+
+from file_manager.utils import content
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"hello world\nfoo bar\nfoo foo baz\n")
+    return path
+
+
+def test_hits_report_line_and_offset(text_file):
+    hits = content.search_file(str(text_file), content.compile_pattern(["foo"], False))
+
+    assert hits == [(2, 12, b"foo bar"), (3, 20, b"foo foo baz")]
+
+
+def test_max_count_stops_early(text_file):
+    hits = content.search_file(str(text_file), content.compile_pattern(["foo"], False), max_count=1)
+
+    assert hits == [(2, 12, b"foo bar")]
+
+
+def test_binary_files_are_skipped(tmp_path):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"foo\0bar")
+
+    assert content.search_file(str(path), content.compile_pattern(["foo"], False)) == []
+
+
+def test_line_numbers_are_counted_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(content, "COUNT_CHUNK_SIZE", 7)
+    path = tmp_path / "a.txt"
+    lines = b"x\n" * 100
+    path.write_bytes(lines + b"needle\n")
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        assert content._count_newlines(data, 3, 150) == lines.count(b"\n", 3, 150)
+
+    assert content.search_file(str(path), content.compile_pattern(["needle"], False)) == [
+        (101, 200, b"needle")
+    ]
+
+
+def test_search_content_command(tmp_path, run_fm, text_file):
+    result = run_fm("search", tmp_path, "foo", "--content", "-m", "1")
+
+    assert f"{text_file}:2:12: foo bar" in result.stdout
+    assert "foo foo baz" not in result.stdout
+
+
+@pytest.mark.parametrize("patterns", [[r"^TODO"], [r"TODO$"], [r"^TODO", r"nothing$"]])
+def test_anchors_match_at_every_line(tmp_path, patterns):
+    path = tmp_path / "a.txt"
+    path.write_bytes(b"first line\nTODO\nlast line\n")
+
+    assert content.search_file(str(path), content.compile_pattern(patterns, True)) == [(2, 11, b"TODO")]
+
+
+def test_search_content_command_with_anchor(tmp_path, run_fm):
+    (tmp_path / "a.txt").write_text("first line\nTODO: fix\n")
+
+    result = run_fm("search", tmp_path, "-x", "^TODO", "--content")
+
+    assert "a.txt:2:11: TODO: fix" in result.stdout
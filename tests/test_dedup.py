@@ -0,0 +1,162 @@
+import os
+from collections import defaultdict
+
+import pytest
+
+from file_manager.utils import hasher, organizer, walker
+
+
+def test_cached_digest_of_rewritten_file_does_not_delete_other_file(tmp_path, run_fm):
+    a_file = tmp_path / "a.bin"
+    a_file.write_bytes(b"XXXXXXXX")
+    (tmp_path / "b.bin").write_bytes(b"ZZZZZZZZ")
+    run_fm("dedup", tmp_path)
+
+    # same size and restored mtime -> only ctime tells the rewritten file apart
+    stat = a_file.stat()
+    a_file.write_bytes(b"YYYYYYYY")
+    os.utime(a_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    (tmp_path / "c.bin").write_bytes(b"XXXXXXXX")
+    run_fm("dedup", tmp_path)
+
+    assert (tmp_path / "c.bin").read_bytes() == b"XXXXXXXX"
+    assert a_file.read_bytes() == b"YYYYYYYY"
+
+
+def test_duplicates_are_merged(tmp_path, run_fm):
+    (tmp_path / "a.bin").write_bytes(b"XXXXXXXX")
+    (tmp_path / "c.bin").write_bytes(b"XXXXXXXX")
+    run_fm("dedup", tmp_path)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.bin"]
+
+
+def _make_duplicate_tree(root):
+    # sizes and digests sort in another order than the files are walked
+    for name, content in [
+        ("a1.txt", "9999"),
+        ("b1.txt", "11"),
+        ("c1.txt", "5555"),
+        ("sub/a2.txt", "9999"),
+        ("sub/b2.txt", "11"),
+        ("sub/c2.txt", "5555"),
+        ("sub/d1.txt", "0000"),
+        ("sub/deep/d2.txt", "0000"),
+        ("sub/e1.txt", "77"),
+        ("sub/e2.txt", "77"),
+    ]:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def test_external_global_dedup_reports_like_in_memory(tmp_path, run_fm):
+    in_memory_dir = tmp_path / "in_memory"
+    external_dir = tmp_path / "external"
+    _make_duplicate_tree(in_memory_dir)
+    _make_duplicate_tree(external_dir)
+
+    in_memory_result = run_fm("dedup", in_memory_dir, "-r", "--global", "--no-cache")
+    external_result = run_fm("dedup", external_dir, "-r", "--global", "--no-cache", "--memory-limit", "1K")
+
+    assert external_result.stdout.replace(str(external_dir), "") == in_memory_result.stdout.replace(
+        str(in_memory_dir), ""
+    )
+
+
+@pytest.mark.parametrize("memory_args", [[], ["--memory-limit", "1K"]])
+def test_symlink_to_file_in_other_dir_keeps_target(tmp_path, run_fm, memory_args):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "file").write_text("content")
+    (tmp_path / "a" / "file").symlink_to("../b/file")
+
+    run_fm("dedup", tmp_path, "-r", "--global", *memory_args)
+
+    assert (tmp_path / "b" / "file").read_text() == "content"
+    assert (tmp_path / "a" / "file").read_text() == "content"
+
+
+def test_hard_links_are_one_candidate(tmp_path, run_fm):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "file.txt").write_text("content")
+    os.link(tmp_path / "a" / "file.txt", tmp_path / "b" / "file.txt")
+
+    result = run_fm("dedup", tmp_path, "-r", "--global")
+
+    assert (tmp_path / "a" / "file.txt").exists()
+    assert (tmp_path / "b" / "file.txt").exists()
+    assert "b/file.txt" not in result.stdout
+
+
+def test_cache_keeps_names_that_are_not_utf8(tmp_path, run_fm):
+    dir_path = os.fsencode(tmp_path)
+    for name in [b"\xff.bin", b"\xfe.bin"]:
+        with open(os.path.join(dir_path, name), "wb") as f:
+            f.write(b"XXXXXXXX")
+
+    run_fm("dedup", tmp_path)
+    run_fm("prune-cache")
+
+    assert len(os.listdir(dir_path)) == 1
+
+
+def _make_staged_files(dir_path):
+    # large files share their size; some also share head and tail but differ in the middle
+    big = hasher.SAMPLE_SIZE * 4
+    head = b"h" * hasher.SAMPLE_SIZE
+    tail = b"t" * hasher.SAMPLE_SIZE
+    middle_size = big - 2 * hasher.SAMPLE_SIZE
+    contents = {
+        "big_a.bin": head + b"1" * middle_size + tail,
+        "big_b.bin": head + b"1" * middle_size + tail,
+        "big_c.bin": head + b"2" * middle_size + tail,
+        "big_d.bin": b"x" * big,
+        "big_e.bin": b"x" * big,
+        "small_a.bin": b"small",
+        "small_b.bin": b"small",
+        "small_c.bin": b"other",
+        "unique.bin": b"no other file has this size",
+    }
+    for name, data in contents.items():
+        (dir_path / name).write_bytes(data)
+
+
+@pytest.mark.parametrize("algorithm", ["sha1", "crc32+verify"])
+def test_staged_hashing_groups_like_full_hash(tmp_path, algorithm):
+    _make_staged_files(tmp_path)
+    entries = sorted(walker.list_entries(str(tmp_path)), key=lambda entry: entry.name)
+
+    with hasher.HashPool(algorithm=algorithm) as hash_pool:
+        content_map = organizer._create_content_map(entries, hash_pool)
+    full_map = defaultdict(list)
+    for entry in entries:
+        full_map[hasher.hash_file(entry.path)].append(entry.name)
+
+    staged_groups = sorted(names for names in content_map.values() if len(names) > 1)
+    assert staged_groups == sorted(names for names in full_map.values() if len(names) > 1)
+    assert staged_groups == [
+        ["big_a.bin", "big_b.bin"],
+        ["big_d.bin", "big_e.bin"],
+        ["small_a.bin", "small_b.bin"],
+    ]
+
+
+@pytest.mark.parametrize("mode_args", [["-r"], ["-r", "--global"]])
+@pytest.mark.parametrize("pool_args", [["-j", "4"], ["-j", "2", "--processes"]])
+def test_parallel_hashing_reports_like_serial(tmp_path, run_fm, mode_args, pool_args):
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    _make_duplicate_tree(serial_dir)
+    _make_duplicate_tree(parallel_dir)
+
+    serial_result = run_fm("dedup", serial_dir, "--no-cache", *mode_args)
+    parallel_result = run_fm("dedup", parallel_dir, "--no-cache", *mode_args, *pool_args)
+
+    assert parallel_result.stdout.replace(str(parallel_dir), "") == serial_result.stdout.replace(
+        str(serial_dir), ""
+    )
+    assert sorted(path.relative_to(parallel_dir) for path in parallel_dir.rglob("*")) == sorted(
+        path.relative_to(serial_dir) for path in serial_dir.rglob("*")
+    )
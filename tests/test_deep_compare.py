@@ -0,0 +1,70 @@
+import filecmp
+import os
+
+import pytest
+
+from file_manager.utils import deep_compare
+
+ATTRS = ["left_only", "right_only", "common_dirs", "common_funny", "same_files", "diff_files", "funny_files"]
+
+
+@pytest.fixture
+def dir_pair(tmp_path):
+    left = tmp_path / "left"
+    right = tmp_path / "right"
+    for side in [left, right]:
+        (side / "common_dir").mkdir(parents=True)
+        (side / "same.txt").write_text("same")
+        (side / "common_dir" / "nested.txt").write_text("nested")
+    (left / "only_left.txt").write_text("x")
+    (right / "only_right.txt").write_text("x")
+    (left / "other_size.txt").write_text("short")
+    (right / "other_size.txt").write_text("much longer")
+    (left / "other_content.txt").write_text("aaaa")
+    (right / "other_content.txt").write_text("bbbb")
+    (left / "file_or_dir").write_text("file")
+    (right / "file_or_dir").mkdir()
+    # same content written at another time -> dircmp compares the bytes as well
+    os.utime(right / "same.txt", ns=(0, 0))
+    return left, right
+
+
+def test_deep_dircmp_reports_like_dircmp(dir_pair):
+    left, right = dir_pair
+
+    with deep_compare.ContentComparer() as comparer:
+        deep_cmp = deep_compare.DeepDirCmp(str(left), str(right), [], comparer)
+    cmp_obj = filecmp.dircmp(str(left), str(right), ignore=[])
+
+    for attr in ATTRS:
+        assert getattr(deep_cmp, attr) == sorted(getattr(cmp_obj, attr)), attr
+
+
+def test_deep_dircmp_compares_content_of_equal_signatures(dir_pair):
+    left, right = dir_pair
+    (left / "same_stat.txt").write_text("1111")
+    (right / "same_stat.txt").write_text("2222")
+    os.utime(left / "same_stat.txt", ns=(0, 0))
+    os.utime(right / "same_stat.txt", ns=(0, 0))
+
+    with deep_compare.ContentComparer() as comparer:
+        deep_cmp = deep_compare.DeepDirCmp(str(left), str(right), [], comparer)
+
+    assert "same_stat.txt" in deep_cmp.diff_files
+    assert "same_stat.txt" in filecmp.dircmp(str(left), str(right)).same_files
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_deep_walk_visits_common_dirs_in_order(dir_pair, jobs):
+    left, right = dir_pair
+
+    cmp_objs = list(deep_compare.walk_deep_diff(str(left), str(right), [], False, True, jobs))
+
+    assert [cmp_obj.left for cmp_obj in cmp_objs] == [str(left), str(left / "common_dir")]
+    assert cmp_objs[1].same_files == ["nested.txt"]
+
+
+def test_deep_diff_command_prints_like_diff(dir_pair, run_fm):
+    left, right = dir_pair
+
+    assert run_fm("diff", left, right, "-r", "--deep").stdout == run_fm("diff", left, right, "-r").stdout
@@ -0,0 +1,57 @@
+import json
+import os
+import time
+
+import pytest
+
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture
+def find_dir(tmp_path):
+    now = time.time()
+    for name, size, age_days in [
+        ("small.txt", 10, 1),
+        ("big.bin", 5000, 1),
+        ("old.txt", 100, 100),
+        ("nested/deep.pdf", 2000, 30),
+    ]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+        os.utime(path, (now - age_days * DAY, now - age_days * DAY))
+    (tmp_path / "docs").mkdir()
+    return tmp_path
+
+
+def _found_names(result):
+    return sorted(os.path.basename(json.loads(line)["path"]) for line in result.stdout.splitlines())
+
+
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        (["--min-size", "1K", "-t", "f"], ["big.bin"]),
+        (["--max-size", "100"], ["old.txt", "small.txt"]),
+        (["--min-size", "50", "--max-size", "1K"], ["old.txt"]),
+        (["--newer", "7d", "-t", "f"], ["big.bin", "small.txt"]),
+        (["--older", "90d"], ["old.txt"]),
+        (["--newer", "60d", "--older", "7d", "-r"], ["deep.pdf"]),
+        (["-t", "d"], ["docs", "nested"]),
+        (["--ext", ".txt,.pdf", "-r"], ["deep.pdf", "old.txt", "small.txt"]),
+        (["-n", "o", "-t", "f"], ["old.txt"]),
+        (["-t", "f", "-r", "--min-size", "1K"], ["big.bin", "deep.pdf"]),
+    ],
+)
+def test_find_predicates(find_dir, run_fm, args, expected):
+    result = run_fm("find", find_dir, *args, "--format", "ndjson")
+
+    assert _found_names(result) == expected
+
+
+def test_find_newer_than_date(find_dir, run_fm):
+    date = time.strftime("%Y-%m-%d", time.localtime(time.time() - 10 * DAY))
+
+    result = run_fm("find", find_dir, "--newer", date, "-t", "f", "--format", "ndjson")
+
+    assert _found_names(result) == ["big.bin", "small.txt"]
@@ -0,0 +1,51 @@
+import errno
+import os
+
+import pytest
+
+from file_manager.utils import linker
+
+
+@pytest.fixture
+def duplicates(tmp_path):
+    (tmp_path / "a.bin").write_bytes(b"XXXXXXXX")
+    (tmp_path / "b.bin").write_bytes(b"XXXXXXXX")
+    return tmp_path
+
+
+def _fail_with(error_number):
+    def fail(*args, **kwargs):
+        raise OSError(error_number, os.strerror(error_number))
+
+    return fail
+
+
+def test_duplicates_are_hard_linked(duplicates, run_fm):
+    run_fm("dedup", duplicates, "--link", "hard")
+
+    assert os.path.samefile(duplicates / "a.bin", duplicates / "b.bin")
+
+
+@pytest.mark.parametrize(
+    "link_type, target, attr",
+    [("hard", os, "link"), ("reflink", linker.fcntl, "ioctl")],
+)
+def test_unsupported_link_keeps_duplicate(duplicates, run_fm, monkeypatch, link_type, target, attr):
+    monkeypatch.setattr(target, attr, _fail_with(errno.EXDEV))
+
+    result = run_fm("dedup", duplicates, "--link", link_type)
+
+    assert f"{link_type} links not supported" in result.stdout
+    assert sorted(os.listdir(duplicates)) == ["a.bin", "b.bin"]
+    assert (duplicates / "b.bin").read_bytes() == b"XXXXXXXX"
+    assert not os.path.samefile(duplicates / "a.bin", duplicates / "b.bin")
+
+
+def test_failed_link_leaves_target_in_place(duplicates, monkeypatch):
+    monkeypatch.setattr(os, "link", _fail_with(errno.EIO))
+
+    with pytest.raises(OSError):
+        linker.link_duplicate(str(duplicates / "a.bin"), str(duplicates / "b.bin"), linker.HARD_LINK)
+
+    assert sorted(os.listdir(duplicates)) == ["a.bin", "b.bin"]
+    assert (duplicates / "b.bin").read_bytes() == b"XXXXXXXX"
@@ -0,0 +1,17 @@
+import os
+
+
+def test_file_without_digest_on_one_side_is_reported_as_differing(tmp_path, run_fm):
+    (tmp_path / "left").mkdir()
+    (tmp_path / "right").mkdir()
+    (tmp_path / "left" / "f.txt").write_text("hi")
+    right_file = tmp_path / "right" / "f.txt"
+    right_file.write_text("ho")
+    os.utime(right_file, ns=(0, 0))
+    run_fm("snapshot", tmp_path / "left", "-o", tmp_path / "left.json", "--hash", "sha1")
+    run_fm("snapshot", tmp_path / "right", "-o", tmp_path / "right.json")
+
+    result = run_fm("diff", tmp_path / "left.json", tmp_path / "right.json")
+
+    assert "Differing files" in result.stdout
+    assert "Trouble" not in result.stdout
@@ -0,0 +1,27 @@
+import pytest
+
+from file_manager.utils.matcher import NameMatcher
+
+
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        [r"(a)\1", r"(b)\1"],
+        [r"(?P<x>a)(?P=x)", r"(?P<y>b)(?P=y)"],
+    ],
+)
+def test_backreferences_of_every_pattern_keep_their_group(patterns):
+    matcher = NameMatcher(patterns, use_regex=True)
+
+    assert matcher.search("aa.txt")
+    assert matcher.search("bb.txt")
+    assert not matcher.search("ab.txt")
+    assert matcher.get_matches("bb.txt") == [patterns[1]]
+
+
+def test_patterns_without_groups_are_combined():
+    matcher = NameMatcher([r"\.txt$", "^notes"], use_regex=True)
+
+    assert matcher.search("a.txt")
+    assert matcher.search("notes.md")
+    assert not matcher.search("a.md")
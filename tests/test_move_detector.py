@@ -0,0 +1,46 @@
+import json
+import os
+
+from file_manager.utils import hasher, move_detector
+
+
+def _stat_files(*paths):
+    return [(str(path), os.stat(path)) for path in paths]
+
+
+def test_renamed_file_is_reported_as_moved(tmp_path, run_fm):
+    (tmp_path / "left" / "sub").mkdir(parents=True)
+    (tmp_path / "right" / "other").mkdir(parents=True)
+    (tmp_path / "left" / "sub" / "a.txt").write_text("content one")
+    (tmp_path / "right" / "other" / "renamed.txt").write_text("content one")
+
+    result = run_fm(
+        "diff", tmp_path / "left", tmp_path / "right", "-r", "--detect-moves", "--format", "ndjson"
+    )
+
+    statuses = {json.loads(line)["path"]: json.loads(line)["status"] for line in result.stdout.splitlines()}
+    moved_to = str(tmp_path / "right" / "other" / "renamed.txt")
+    assert statuses[str(tmp_path / "left" / "sub" / "a.txt")] == f"moved_to:{moved_to}"
+
+
+def test_moves_need_equal_content_and_each_target_is_used_once(tmp_path):
+    for name, content in [
+        ("l1", "same"),
+        ("l2", "same"),
+        ("l3", "diff"),
+        ("r1", "same"),
+        ("r2", "fdif"),
+        ("e1", ""),
+    ]:
+        (tmp_path / name).write_text(content)
+    (tmp_path / "e2").write_text("")
+
+    with hasher.HashPool() as hash_pool:
+        moves = move_detector.find_moves(
+            _stat_files(tmp_path / "l1", tmp_path / "l2", tmp_path / "l3", tmp_path / "e1"),
+            _stat_files(tmp_path / "r1", tmp_path / "r2", tmp_path / "e2"),
+            hash_pool,
+        )
+
+    # equally sized files of other content and empty files are never moves
+    assert moves == [(str(tmp_path / "l1"), str(tmp_path / "r1"))]
@@ -0,0 +1,105 @@
+import json
+import os
+import re
+
+import pytest
+
+from file_manager.utils.name_index import _get_required_literals
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for rel_path in ["report_1.txt", "notes.md", "sub/report_2.txt", "sub/deep/report_3.txt", "sub/old.md"]:
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    (tmp_path / "reports").mkdir()
+    return tmp_path
+
+
+def _found_paths(result):
+    return sorted(json.loads(line)["path"] for line in result.stdout.splitlines())
+
+
+@pytest.mark.parametrize("recursive_args", [[], ["-r"]])
+@pytest.mark.parametrize("pattern_args", [["report"], ["--regex", r"report_\d+\.txt"]])
+def test_index_search_matches_walk(tree, run_fm, recursive_args, pattern_args):
+    run_fm("index", tree)
+    search_args = ["search", tree, *pattern_args, *recursive_args, "--format", "ndjson"]
+
+    walk_result = run_fm(*search_args)
+    index_result = run_fm(*search_args, "--index")
+
+    assert _found_paths(index_result) == _found_paths(walk_result)
+    assert _found_paths(walk_result)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"report_\d+\.txt",
+        r"a[]bc]defg",
+        r"[^]x]hello",
+        r"ab{2,3}cdef",
+        r"abc(de)?fgh",
+        r"foo\.bar?",
+        r"(?i)Hello",
+        r"\x41bcd",
+        r"\101bcd",
+        r"\u0041bcd",
+        r"\U00000041bcd",
+        r"\N{LATIN CAPITAL LETTER A}bcd",
+        r"(b)\1bcd",
+    ],
+)
+def test_required_literals_are_part_of_every_match(pattern):
+    regex = re.compile(pattern)
+    samples = [
+        "report_12.txt",
+        "a]defg",
+        "a hello",
+        "abbcdef",
+        "abcfgh",
+        "foo.ba",
+        "HELLO",
+        "Abcd.txt",
+        "bbbcd",
+    ]
+
+    matches = list(filter(regex.search, samples))
+
+    assert matches
+    for sample in matches:
+        assert all(literal.lower() in sample.lower() for literal in _get_required_literals(pattern))
+
+
+@pytest.mark.parametrize("pattern", ["abc|def", "(?x)abc def", "x(a|b)y"])
+def test_patterns_without_required_literals(pattern):
+    assert _get_required_literals(pattern) == []
+
+
+def test_index_search_with_escape_codes(tmp_path, run_fm):
+    (tmp_path / "Abc.txt").write_text("x")
+    run_fm("index", tmp_path)
+
+    result = run_fm("search", tmp_path, "--regex", r"\x41bc", "--index", "--format", "ndjson")
+
+    assert _found_paths(result) == [str(tmp_path / "Abc.txt")]
+
+
+def test_index_keeps_names_that_are_not_utf8(tmp_path, run_fm):
+    dir_path = os.path.join(os.fsencode(tmp_path), b"\xfe_dir")
+    os.mkdir(dir_path)
+    os.mkdir(os.path.join(dir_path, b"gone"))
+    with open(os.path.join(dir_path, b"\xff_report.txt"), "wb") as f:
+        f.write(b"x")
+    run_fm("index", tmp_path)
+    os.rmdir(os.path.join(dir_path, b"gone"))
+    run_fm("index", tmp_path)
+
+    result = run_fm("search", tmp_path, "report", "-r", "--index", "--format", "ndjson")
+
+    lines = result.stdout_bytes.decode("utf-8", "surrogateescape").splitlines()
+    assert [os.fsencode(json.loads(line)["path"]) for line in lines] == [
+        os.path.join(dir_path, b"\xff_report.txt")
+    ]
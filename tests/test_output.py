@@ -0,0 +1,81 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+
+from file_manager.logs.output_sink import OutputSink
+from file_manager.utils import scanner
+from file_manager.utils.matcher import NameMatcher
+
+
+@pytest.mark.parametrize("command", ["scan", "search", "tree"])
+def test_records_are_written_to_stdout(tmp_path, run_fm, command):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "sub").mkdir()
+    args = [command, tmp_path, "a"] if command == "search" else [command, tmp_path]
+
+    result = run_fm(*args, "--format", "ndjson")
+
+    assert result.stderr == ""
+    paths = {json.loads(line)["path"] for line in result.stdout.splitlines()}
+    assert str(tmp_path / "a.txt") in paths
+
+
+def test_csv_header_is_written_once_to_stdout(tmp_path, run_fm):
+    (tmp_path / "a.txt").write_text("a")
+
+    result = run_fm("scan", tmp_path, "--format", "csv")
+
+    assert result.stderr == ""
+    assert result.stdout.splitlines()[0] == "path,type,size,mtime,status"
+    assert len(result.stdout.splitlines()) == 2
+
+
+def test_text_output_is_written_to_stdout(tmp_path, run_fm):
+    (tmp_path / "a.txt").write_text("a")
+
+    result = run_fm("show", tmp_path)
+
+    assert result.stderr == ""
+    assert "a.txt" in result.stdout
+
+
+def test_names_that_are_not_utf8_are_written_as_bytes(tmp_path, run_fm):
+    (tmp_path / "dir").mkdir()
+    with open(os.path.join(os.fsencode(tmp_path / "dir"), b"\xff.txt"), "wb") as f:
+        f.write(b"a")
+
+    result = run_fm("scan", tmp_path / "dir", "-s", "-o", tmp_path, "--log", "scan.log")
+
+    assert b"\xff.txt" in result.stdout_bytes
+    assert b"\xff.txt" in (tmp_path / "scan.log").read_bytes()
+
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+@pytest.mark.parametrize("stream_type, is_written", [(_Terminal, True), (io.StringIO, False)])
+def test_messages_are_written_at_once_to_a_terminal(monkeypatch, stream_type, is_written):
+    stream = stream_type()
+    monkeypatch.setattr(sys, "stdout", stream)
+
+    sink = OutputSink()
+    sink.info("first hit\n")
+
+    assert (stream.getvalue() == "first hit\n") is is_written
+    sink.close()
+    assert stream.getvalue() == "first hit\n"
+
+
+def test_search_hits_are_streamed_one_by_one(tmp_path):
+    for name in ["a_hit.txt", "b.txt", "c_hit.txt"]:
+        (tmp_path / name).write_text("x")
+    name_matcher = NameMatcher(["hit"], use_regex=False)
+
+    messages = list(scanner._stream_search(str(tmp_path), name_matcher))
+
+    assert sorted(msg for msg in messages if "hit.txt" in msg) == ["\t- a_hit.txt\n", "\t- c_hit.txt\n"]
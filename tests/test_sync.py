@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.fixture
+def trees(tmp_path):
+    source = tmp_path / "source"
+    target = tmp_path / "target"
+    (source / "was_file").mkdir(parents=True)
+    (source / "was_file" / "inner.txt").write_text("inner")
+    (source / "was_dir").write_text("file")
+    (target / "was_dir").mkdir(parents=True)
+    (target / "was_dir" / "old.txt").write_text("old")
+    (target / "was_file").write_text("file")
+    return source, target
+
+
+@pytest.mark.parametrize("deep_args", [[], ["--deep"]])
+def test_entries_of_another_type_are_replaced(trees, run_fm, deep_args):
+    source, target = trees
+
+    run_fm("sync", source, target, *deep_args)
+
+    assert (target / "was_file" / "inner.txt").read_text() == "inner"
+    assert (target / "was_dir").read_text() == "file"
+
+
+def test_dry_run_keeps_entries_of_another_type(trees, run_fm):
+    source, target = trees
+
+    result = run_fm("sync", source, target, "--dry-run")
+
+    assert (target / "was_dir" / "old.txt").read_text() == "old"
+    assert (target / "was_file").read_text() == "file"
+    assert str(target / "was_dir") in result.stdout
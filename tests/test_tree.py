@@ -0,0 +1,51 @@
+import pytest
+
+from file_manager.utils import walker
+
+
+@pytest.fixture
+def tree_dir(tmp_path):
+    for rel_path in [".hidden/inner/secret.txt", "visible/sub/deep/file.txt", "ignored/x/y.txt", "top.txt"]:
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+    return tmp_path
+
+
+@pytest.fixture
+def listed_dirs(monkeypatch):
+    listed = []
+    list_entries = walker.list_entries
+
+    def spy(dir_path):
+        listed.append(dir_path)
+        return list_entries(dir_path)
+
+    monkeypatch.setattr(walker, "list_entries", spy)
+    return listed
+
+
+def test_hidden_and_ignored_subtrees_are_never_listed(tree_dir, run_fm, listed_dirs):
+    result = run_fm("tree", tree_dir, "-i", "ignored")
+
+    assert sorted(listed_dirs) == sorted(
+        str(tree_dir / rel_path) for rel_path in ["", "visible", "visible/sub", "visible/sub/deep"]
+    )
+    assert "secret.txt" not in result.stdout
+    assert "y.txt" not in result.stdout
+    assert "file.txt" in result.stdout
+
+
+def test_hidden_subtrees_are_walked_with_hidden_flag(tree_dir, run_fm, listed_dirs):
+    result = run_fm("tree", tree_dir, "-h")
+
+    assert str(tree_dir / ".hidden" / "inner") in listed_dirs
+    assert "secret.txt" in result.stdout
+
+
+def test_dirs_past_level_are_printed_but_not_listed(tree_dir, run_fm, listed_dirs):
+    result = run_fm("tree", tree_dir, "-l", "1")
+
+    assert str(tree_dir / "visible" / "sub") in result.stdout
+    assert str(tree_dir / "visible" / "sub") not in listed_dirs
+    assert "file.txt" not in result.stdout
@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from file_manager.utils import walker
+
+WIDTH = 200
+
+
+def _list_dir(item):
+    # the root has WIDTH subdirs with two subdirs each
+    if item == ():
+        return item, [(idx,) for idx in range(WIDTH)]
+    if len(item) == 1:
+        return item, [(*item, 0), (*item, 1)]
+    return item, []
+
+
+@pytest.mark.parametrize("jobs", [2, 4])
+def test_parallel_walk_keeps_pre_order(jobs):
+    serial = [item for item, _ in walker.walk_tree((), _list_dir, lambda listing: listing[1])]
+    parallel = [item for item, _ in walker.walk_tree((), _list_dir, lambda listing: listing[1], jobs)]
+
+    assert parallel == serial
+
+
+def test_parallel_walk_bounds_pending_listings():
+    listed = []
+    lock = threading.Lock()
+
+    def list_dir(item):
+        with lock:
+            listed.append(item)
+        return _list_dir(item)
+
+    walk = walker.walk_tree((), list_dir, lambda listing: listing[1], 2)
+    next(walk)
+    next(walk)
+    time.sleep(0.2)
+
+    assert len(listed) <= 2 + 2 * walker.PENDING_PER_WORKER
+    walk.close()
+
+
+@pytest.fixture
+def wide_tree(tmp_path):
+    for top in range(6):
+        for sub in range(4):
+            dir_path = tmp_path / f"dir_{top}" / f"sub_{sub}"
+            dir_path.mkdir(parents=True)
+            (dir_path / f"file_{top}_{sub}.txt").write_text("x" * (top + sub))
+        (tmp_path / f"dir_{top}" / f"report_{top}.txt").write_text("x")
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["scan", "-r"],
+        ["scan", "-r", "--sort", "size"],
+        ["search", "report", "-r"],
+        ["tree"],
+        ["tree", "--format", "ndjson"],
+    ],
+)
+def test_parallel_commands_print_like_serial(wide_tree, run_fm, args):
+    command, *options = args
+    serial_result = run_fm(command, wide_tree, *options)
+
+    for jobs in ["2", "8"]:
+        assert run_fm(command, wide_tree, *options, "-j", jobs).stdout == serial_result.stdout